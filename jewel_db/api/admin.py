@@ -0,0 +1,82 @@
+# jewel_db/api/admin.py
+import secrets
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+from starlette.background import BackgroundTask
+
+from jewel_db.core.dependencies import get_db
+from jewel_db.core.query_log import slow_query_log
+from jewel_db.core.settings import settings
+from jewel_db.services.backup import (
+    BackupNotSupported,
+    snapshot,
+    snapshot_path,
+    stream_archive,
+)
+
+
+def require_admin_token(
+    token: str | None = Header(None, alias="X-Admin-Token"),
+) -> None:
+    """The admin API is off unless ``settings.admin_token`` is set, then required."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Admin API is disabled")
+    if not token or not secrets.compare_digest(
+        token.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)]
+)
+
+MEDIA_DIR = Path(settings.media_dir)
+
+
+@router.get("/slow-queries")
+def list_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent slow statements, newest first."""
+    return slow_query_log.entries(limit)
+
+
+@router.delete("/slow-queries", status_code=204)
+def clear_slow_queries():
+    slow_query_log.clear()
+
+
+@router.get("/backup")
+def download_backup(
+    media: bool = Query(False, description="also bundle the images in media/"),
+    session: Session = Depends(get_db),
+):
+    """
+    Consistent snapshot of the live database as a ``.tar.gz``, taken without
+    pausing writes. Throughput and lock hold times are in ``X-Backup-*``.
+    """
+    engine = session.get_bind()
+    target = snapshot_path()
+    try:
+        stats = snapshot(engine, target)
+    except BackupNotSupported as exc:
+        target.unlink(missing_ok=True)
+        raise HTTPException(status_code=501, detail=str(exc))
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    db_name = Path(engine.url.database or "jewel.db").name
+    filename = f"jewel-backup-{stats.created_at:%Y%m%d-%H%M%S}.tar.gz"
+    return StreamingResponse(
+        stream_archive(
+            target, stats, db_name=db_name, media_dir=MEDIA_DIR if media else None
+        ),
+        media_type="application/gzip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            **stats.headers(),
+        },
+        background=BackgroundTask(target.unlink, missing_ok=True),
+    )
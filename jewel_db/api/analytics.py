@@ -0,0 +1,22 @@
+# jewel_db/api/analytics.py
+from fastapi import APIRouter, Depends, Query
+
+from jewel_db.core.dependencies import get_item_stats
+from jewel_db.schemas.analytics import AnalyticsRead
+from jewel_db.services.analytics import ItemStats
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/", response_model=AnalyticsRead)
+def read_analytics(
+    bins: int = Query(20, ge=1, le=200),
+    outlier_k: float = Query(1.5, gt=0, description="IQR multiplier"),
+    outlier_limit: int = Query(50, ge=0, le=1000),
+    stats: ItemStats = Depends(get_item_stats),
+):
+    """
+    Price and weight distributions, price per gram by material and gemstone,
+    and items whose price per gram is unusual for their material.
+    """
+    return stats.summary(bins, outlier_k, outlier_limit)
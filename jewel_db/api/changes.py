@@ -0,0 +1,75 @@
+# jewel_db/api/changes.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from jewel_db.core.dependencies import get_db
+from jewel_db.models.change_log import ChangeLog
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.models.jewelry_tag import JewelryTag
+from jewel_db.schemas.change_log import ChangeFeed, ChangeRead
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+_MODELS = {"item": JewelryItem, "image": JewelryImage, "tag": JewelryTag}
+
+
+def _current(session: Session, entity: str, ids: list[int]) -> dict[int, object]:
+    """Current rows of one entity kind, by id."""
+    model = _MODELS[entity]
+    stmt = select(model).where(model.id.in_(ids))
+    if model is JewelryItem:
+        stmt = stmt.options(selectinload(JewelryItem.tags))
+    return {row.id: row for row in session.exec(stmt)}
+
+
+@router.get("/", response_model=ChangeFeed)
+def list_changes(
+    since: int = Query(0, ge=0, description="`next` from the previous poll"),
+    limit: int = Query(500, ge=1, le=5000),
+    session: Session = Depends(get_db),
+):
+    """
+    Items, images and tags changed after *since*, oldest first, with their
+    current state; deletes come back as tombstones (``op == "delete"``).
+    Several changes to the same row within one page collapse into the latest.
+    """
+    rows = session.exec(
+        select(ChangeLog)
+        .where(ChangeLog.seq > since)
+        .order_by(ChangeLog.seq)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    latest = {(row.entity, row.entity_id): row for row in rows}
+    current = {
+        entity: _current(
+            session,
+            entity,
+            [i for (e, i), row in latest.items() if e == entity and row.op != "delete"],
+        )
+        for entity in _MODELS
+    }
+    changes = [
+        ChangeRead(
+            **row.model_dump(),
+            **{row.entity: current[row.entity].get(row.entity_id)},
+        )
+        for row in sorted(latest.values(), key=lambda r: r.seq)
+    ]
+    return ChangeFeed(
+        changes=changes, next=rows[-1].seq if rows else since, has_more=has_more
+    )
+
+
+@router.get("/head", response_model=ChangeFeed)
+def change_head(session: Session = Depends(get_db)):
+    """
+    The current token without any changes. A new client reads it *before*
+    its full ``GET /api/items`` download, then polls from there.
+    """
+    head = session.exec(select(func.max(ChangeLog.seq))).one()
+    return ChangeFeed(changes=[], next=head or 0, has_more=False)
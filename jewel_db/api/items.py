@@ -1,45 +1,93 @@
 # jewel_db/api/items.py
 from __future__ import annotations
 
-import uuid
+import zipfile
 from pathlib import Path
 
-from fastapi import APIRouter, Body, Depends, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from sqlmodel import Session, select
 
-from jewel_db.core.dependencies import get_db
+from jewel_db.api.jobs import read_jobs
+from jewel_db.core.dependencies import get_db, get_image_index, get_tag_index
+from jewel_db.core.etags import (
+    etag_matches,
+    last_change_seq,
+    make_etag,
+    not_modified,
+)
+from jewel_db.core.settings import settings
+from jewel_db.models.image_job import ImageJob
 from jewel_db.models.jewelry_image import JewelryImage
 from jewel_db.models.jewelry_item import JewelryItem
 from jewel_db.models.jewelry_tag import JewelryTag
+from jewel_db.schemas.image_job import BulkUploadReport, ImageJobRead
+from jewel_db.schemas.jewelry_image import SimilarImage
 from jewel_db.schemas.jewelry_item import (
+    BatchItemResult,
+    BatchUpdateReport,
+    JewelryItemBatchPatch,
     JewelryItemCreate,
     JewelryItemRead,
     JewelryItemUpdate,
 )
-from jewel_db.services.image_utils import normalise_image
+from jewel_db.services.batch_update import (
+    BatchUpdateError,
+    update_items,
+    update_matching,
+)
+from jewel_db.services.bulk_upload import import_archive
+from jewel_db.services.image_index import ImageHashIndex
+from jewel_db.services.image_index import similar_images as find_similar
+from jewel_db.services.image_jobs import enqueue_upload
+from jewel_db.services.tag_index import (
+    TagExpressionError,
+    TagIndex,
+    tag_filter_clause,
+)
 
 router = APIRouter(prefix="/items", tags=["items"])
 
-MEDIA_DIR = Path("media")
+MEDIA_DIR = Path(settings.media_dir)
 ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 MEDIA_DIR.mkdir(exist_ok=True)
 
+
+def item_etag(item_id: int, version: int) -> str:
+    return make_etag("item", item_id, version)
+
+
 # ─── Image endpoints ─────────────────────────────────────────────────────────
 
 
 @router.post(
     "/{item_id}/images",
-    response_model=list[JewelryImage],
-    status_code=201,
+    response_model=list[ImageJobRead],
+    status_code=202,
 )
-async def upload_item_images(
+def upload_item_images(
     item_id: int,
     files: list[UploadFile] = File([]),
     session: Session = Depends(get_db),
+    hashes: ImageHashIndex = Depends(get_image_index),
 ):
-    # ... your existing image logic untouched ...
+    """
+    Spool the raw files and queue them for normalisation; poll the returned
+    jobs (``GET /api/jobs/{id}``) for progress and duplicate warnings.
+    """
     files = [
         f for f in files if f.filename and f.content_type != "application/octet-stream"
     ]
@@ -48,6 +96,8 @@ async def upload_item_images(
     item = session.get(JewelryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    if any(f.content_type not in ALLOWED_TYPES for f in files):
+        raise HTTPException(status_code=400, detail="Invalid image type")
     max_order = (
         session.exec(
             select(JewelryImage.sort_order)
@@ -56,26 +106,44 @@ async def upload_item_images(
         ).first()
         or 0
     )
-    saved: list[JewelryImage] = []
+    jobs: list[ImageJob] = []
     for idx, upload in enumerate(files):
-        if upload.content_type not in ALLOWED_TYPES:
-            raise HTTPException(status_code=400, detail="Invalid image type")
-        raw = await upload.read()
-        if upload.content_type == "image/gif":
-            data, ext = raw, ".gif"
-        else:
-            data, ext = normalise_image(raw, upload.content_type)
-        fname = f"{uuid.uuid4().hex}{ext}"
-        (MEDIA_DIR / fname).write_bytes(data)
-        img = JewelryImage(
-            url=f"/media/{fname}",
-            sort_order=max_order + idx + 1,
+        _img, job = enqueue_upload(
+            session,
             item_id=item_id,
+            stream=upload.file,
+            content_type=upload.content_type,
+            sort_order=max_order + idx + 1,
+            media_dir=MEDIA_DIR,
         )
-        session.add(img)
-        saved.append(img)
+        jobs.append(job)
     session.commit()
-    return saved
+    return read_jobs(session, hashes, jobs)
+
+
+@router.post(
+    "/images/bulk",
+    response_model=BulkUploadReport,
+    status_code=202,
+)
+def bulk_upload_images(
+    archive: UploadFile = File(..., description="ZIP of <item id|name>[_n].<ext>"),
+    session: Session = Depends(get_db),
+):
+    """
+    Queue every image in a ZIP archive for the item its file name refers to,
+    e.g. ``42_1.jpg`` or ``Gold Ring_2.png``; returns a per-file report.
+    """
+    try:
+        results = import_archive(
+            session, archive.file, allowed_types=ALLOWED_TYPES, media_dir=MEDIA_DIR
+        )
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Not a valid ZIP archive")
+    queued = sum(r.status == "queued" for r in results)
+    return BulkUploadReport(
+        queued=queued, not_queued=len(results) - queued, results=results
+    )
 
 
 @router.get(
@@ -84,12 +152,19 @@ async def upload_item_images(
 )
 def list_item_images(
     item_id: int,
+    request: Request,
+    response: Response,
     session: Session = Depends(get_db),
 ):
-    # ... unchanged ...
-    item = session.get(JewelryItem, item_id)
-    if not item:
+    if (
+        session.exec(select(JewelryItem.id).where(JewelryItem.id == item_id)).first()
+        is None
+    ):
         raise HTTPException(status_code=404, detail="Item not found")
+    etag = make_etag("images", item_id, last_change_seq(session, "image", item_id))
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers["ETag"] = etag
     return session.exec(
         select(JewelryImage)
         .where(JewelryImage.item_id == item_id)
@@ -97,6 +172,25 @@ def list_item_images(
     ).all()
 
 
+@router.get(
+    "/{item_id}/images/{image_id}/similar",
+    response_model=list[SimilarImage],
+)
+def similar_images(
+    item_id: int,
+    image_id: int,
+    max_distance: int = Query(10, ge=0, le=64),
+    limit: int = Query(20, ge=1, le=200),
+    session: Session = Depends(get_db),
+    hashes: ImageHashIndex = Depends(get_image_index),
+):
+    """Perceptually similar images across all items, closest first."""
+    img = session.get(JewelryImage, image_id)
+    if not img or img.item_id != item_id:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return find_similar(hashes, img, max_distance, limit)
+
+
 @router.patch("/{item_id}/images/reorder", status_code=204)
 def reorder_images(
     item_id: int,
@@ -118,6 +212,7 @@ def delete_item_image(
     item_id: int,
     image_id: int,
     session: Session = Depends(get_db),
+    hashes: ImageHashIndex = Depends(get_image_index),
 ):
     # ... unchanged ...
     img = session.get(JewelryImage, image_id)
@@ -131,6 +226,7 @@ def delete_item_image(
         pass
     session.delete(img)
     session.commit()
+    hashes.remove(image_id)
     remaining = session.exec(
         select(JewelryImage)
         .where(JewelryImage.item_id == item_id)
@@ -146,6 +242,21 @@ def delete_item_image(
 # ─── CRUD endpoints ───────────────────────────────────────────────────────────
 
 
+def _resolve_tags(session: Session, names: list[str]) -> list[JewelryTag]:
+    """Existing tags by (lower-cased) name; missing ones are added."""
+    tags: list[JewelryTag] = []
+    for name in names:
+        nm = name.lower().strip()
+        if not nm:
+            continue
+        tag = session.exec(select(JewelryTag).where(JewelryTag.name == nm)).first()
+        if not tag:
+            tag = JewelryTag(name=nm)
+            session.add(tag)
+        tags.append(tag)
+    return tags
+
+
 @router.post(
     "/",
     response_model=JewelryItemRead,
@@ -154,17 +265,11 @@ def delete_item_image(
 def create_item(
     *,
     session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
     item_in: JewelryItemCreate,
 ):
     # ── lowercase & link tags ────────────────────────────────────────────
-    tag_objs: list[JewelryTag] = []
-    for name in item_in.tags or []:
-        nm = name.lower().strip()
-        tag = session.exec(select(JewelryTag).where(JewelryTag.name == nm)).first()
-        if not tag:
-            tag = JewelryTag(name=nm)
-            session.add(tag)
-        tag_objs.append(tag)
+    tag_objs = _resolve_tags(session, item_in.tags or [])
 
     # ── create the item ─────────────────────────────────────────────────
     item = JewelryItem.model_validate(item_in, update={"tags": tag_objs})
@@ -179,6 +284,7 @@ def create_item(
     # ── refresh & ensure tags are loaded ──
     session.refresh(item)  # pulls DB-generated fields into the same instance
     _ = item.tags  # triggers lazy load so response includes tags
+    index.set_item_tags(item.id, (t.name for t in item.tags))
 
     return item
 
@@ -187,10 +293,21 @@ def create_item(
     "/",
     response_model=list[JewelryItemRead],
 )
-def list_items(*, session: Session = Depends(get_db)):
-    items = session.exec(
-        select(JewelryItem).options(selectinload(JewelryItem.tags))
-    ).all()
+def list_items(
+    *,
+    session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
+    tags: str | None = Query(
+        None, description='Tag expression, e.g. "gold AND vintage AND NOT ring"'
+    ),
+):
+    stmt = select(JewelryItem).options(selectinload(JewelryItem.tags))
+    if tags:
+        try:
+            stmt = stmt.where(tag_filter_clause(index, tags))
+        except TagExpressionError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    items = session.exec(stmt).all()
     return items
 
 
@@ -202,7 +319,16 @@ def get_item(
     *,
     session: Session = Depends(get_db),
     item_id: int,
+    request: Request,
+    response: Response,
 ):
+    version = session.exec(
+        select(JewelryItem.version).where(JewelryItem.id == item_id)
+    ).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    if cached := not_modified(request, item_etag(item_id, version)):
+        return cached  # nothing (tags included) loaded or serialised
     stmt = (
         select(JewelryItem)
         .options(selectinload(JewelryItem.tags))
@@ -211,9 +337,50 @@ def get_item(
     item = session.exec(stmt).first()
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    response.headers["ETag"] = item_etag(item.id, item.version)
     return item
 
 
+@router.patch("/batch", response_model=BatchUpdateReport)
+def batch_update_items(
+    patch: JewelryItemBatchPatch,
+    session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
+):
+    """
+    Update many items in one transaction without loading them: either a
+    list of partial payloads (``items``), or a ``filter`` plus ``set``
+    expressions, e.g. ``{"field": "price", "op": "mul", "value": 1.04,
+    "round": 2}`` for every item with ``material == "gold"``. A filter
+    without criteria must say ``"all": true``.
+    """
+    item_tags: dict[int, list[str]] = {}
+    try:
+        if patch.items is not None:
+            results, item_tags = update_items(session, patch.items)
+        else:
+            ids = update_matching(session, index, patch.filter, patch.set)
+            results = [BatchItemResult(id=i, status="updated") for i in ids]
+        session.commit()
+    except (BatchUpdateError, TagExpressionError) as exc:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except IntegrityError as exc:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=f"Batch rejected: {exc.orig}")
+    except StaleDataError:  # another writer bumped a version after we read it
+        session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Items were modified meanwhile; nothing was updated, retry",
+        )
+    for item_id, names in item_tags.items():
+        index.set_item_tags(item_id, names)
+    return BatchUpdateReport(
+        updated=sum(r.status == "updated" for r in results), results=results
+    )
+
+
 @router.patch(
     "/{item_id}",
     response_model=JewelryItemRead,
@@ -221,12 +388,19 @@ def get_item(
 def update_item(
     *,
     session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
     item_id: int,
     item_in: JewelryItemUpdate,
+    response: Response,
+    if_match: str | None = Header(None, description="ETag from a previous GET"),
 ):
     item = session.get(JewelryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    if if_match is not None and not etag_matches(
+        if_match, item_etag(item_id, item.version), weak=False
+    ):
+        raise HTTPException(status_code=412, detail="Item was modified meanwhile")
 
     data = item_in.model_dump(exclude_unset=True)
     tag_names = data.pop("tags", None)
@@ -237,19 +411,7 @@ def update_item(
 
     # sync tags if provided
     if tag_names is not None:
-        new_tags: list[JewelryTag] = []
-        for name in tag_names:
-            nm = name.lower().strip()
-            if not nm:
-                continue
-            tag = session.exec(select(JewelryTag).where(JewelryTag.name == nm)).first()
-            if not tag:
-                tag = JewelryTag(name=nm)
-                session.add(tag)
-                session.commit()
-                session.refresh(tag)
-            new_tags.append(tag)
-        item.tags = new_tags
+        item.tags = _resolve_tags(session, tag_names)
 
     session.add(item)
     try:
@@ -257,6 +419,9 @@ def update_item(
     except IntegrityError:
         session.rollback()
         raise HTTPException(status_code=400, detail="Name must be unique")
+    except StaleDataError:  # another writer bumped the version first
+        session.rollback()
+        raise HTTPException(status_code=412, detail="Item was modified meanwhile")
 
     # return with tags eagerly loaded
     result = session.exec(
@@ -264,6 +429,9 @@ def update_item(
         .options(selectinload(JewelryItem.tags))
         .where(JewelryItem.id == item_id)
     ).one()
+    if tag_names is not None:
+        index.set_item_tags(item_id, (t.name for t in result.tags))
+    response.headers["ETag"] = item_etag(item_id, result.version)
     return result
 
 
@@ -271,16 +439,24 @@ def update_item(
 async def batch_delete_items(
     ids: list[int] = Body(..., embed=True),
     session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
+    hashes: ImageHashIndex = Depends(get_image_index),
 ):
     if not ids:
         raise HTTPException(status_code=400, detail="`ids` list is empty")
     deleted: list[int] = []
+    image_ids: list[int] = []
     for iid in ids:
         itm = session.get(JewelryItem, iid)
         if itm:
+            image_ids.extend(img.id for img in itm.images)
             session.delete(itm)
             deleted.append(iid)
     session.commit()
+    for iid in deleted:
+        index.drop_item(iid)
+    for image_id in image_ids:
+        hashes.remove(image_id)
     return deleted
 
 
@@ -291,13 +467,19 @@ async def batch_delete_items(
 def delete_item(
     *,
     session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
+    hashes: ImageHashIndex = Depends(get_image_index),
     item_id: int,
 ):
     item = session.get(JewelryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    image_ids = [img.id for img in item.images]
     session.delete(item)
     session.commit()
+    index.drop_item(item_id)
+    for image_id in image_ids:
+        hashes.remove(image_id)
 
 
 @router.patch(
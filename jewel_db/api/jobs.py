@@ -0,0 +1,68 @@
+# jewel_db/api/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session, select
+
+from jewel_db.core.dependencies import get_db, get_image_index
+from jewel_db.core.settings import settings
+from jewel_db.models.image_job import ImageJob
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.schemas.image_job import ImageJobRead
+from jewel_db.services.image_index import ImageHashIndex, similar_images
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def read_jobs(
+    session: Session, hashes: ImageHashIndex, jobs: list[ImageJob]
+) -> list[ImageJobRead]:
+    """Job status joined with its image; duplicates once the image is ready."""
+    image_ids = {job.image_id for job in jobs}
+    images = {
+        img.id: img
+        for img in session.exec(
+            select(JewelryImage).where(JewelryImage.id.in_(image_ids))
+        )
+    }
+    out: list[ImageJobRead] = []
+    for job in jobs:
+        img = images.get(job.image_id)
+        duplicates = []
+        if img is not None and img.status == "ready" and img.phash:
+            if img.id not in hashes:  # processed by a worker since last load
+                hashes.add(img.id, img.item_id, img.phash)
+            duplicates = similar_images(
+                hashes, img, settings.duplicate_max_distance, 10
+            )
+        out.append(
+            ImageJobRead(
+                **job.model_dump(),
+                image_url=img.url if img else None,
+                image_status=img.status if img else None,
+                duplicates=duplicates,
+            )
+        )
+    return out
+
+
+@router.get("/", response_model=list[ImageJobRead])
+def list_jobs(
+    ids: list[int] = Query(..., description="job ids to poll"),
+    session: Session = Depends(get_db),
+    hashes: ImageHashIndex = Depends(get_image_index),
+):
+    jobs = session.exec(
+        select(ImageJob).where(ImageJob.id.in_(ids)).order_by(ImageJob.id)
+    ).all()
+    return read_jobs(session, hashes, list(jobs))
+
+
+@router.get("/{job_id}", response_model=ImageJobRead)
+def get_job(
+    job_id: int,
+    session: Session = Depends(get_db),
+    hashes: ImageHashIndex = Depends(get_image_index),
+):
+    job = session.get(ImageJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return read_jobs(session, hashes, [job])[0]
@@ -1,46 +1,85 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select
 
-from jewel_db.core.dependencies import get_db
+from jewel_db.core.dependencies import get_db, get_tag_index
+from jewel_db.core.etags import last_change_seq, make_etag, not_modified
 from jewel_db.models.jewelry_tag import JewelryTag
-from jewel_db.schemas.jewelry_tag import JewelryTagCreate, JewelryTagUpdate
+from jewel_db.schemas.jewelry_tag import (
+    JewelryTagCreate,
+    JewelryTagSuggestion,
+    JewelryTagUpdate,
+)
+from jewel_db.services.tag_index import TagIndex
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
 
 @router.get("/", response_model=list[JewelryTag])
-def list_tags(session: Session = Depends(get_db)):
+def list_tags(request: Request, response: Response, session: Session = Depends(get_db)):
+    etag = make_etag("tags", last_change_seq(session, "tag"))
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers["ETag"] = etag
     return session.exec(select(JewelryTag).order_by(JewelryTag.name)).all()
 
 
+@router.get("/autocomplete", response_model=list[JewelryTagSuggestion])
+def autocomplete_tags(
+    q: str = "",
+    limit: int = Query(10, ge=1, le=50),
+    index: TagIndex = Depends(get_tag_index),
+):
+    """Tags starting with *q*, most used first (served from memory)."""
+    return [
+        JewelryTagSuggestion(name=name, count=count)
+        for name, count in index.suggest(q, limit)
+    ]
+
+
 @router.post("/", response_model=JewelryTag, status_code=201)
-def create_tag(tag_in: JewelryTagCreate, session: Session = Depends(get_db)):
+def create_tag(
+    tag_in: JewelryTagCreate,
+    session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
+):
     tag = JewelryTag(name=tag_in.name.lower())
     session.add(tag)
     session.commit()
     session.refresh(tag)
+    index.add_tag(tag.name)
     return tag
 
 
 @router.patch("/{tag_id}", response_model=JewelryTag)
 def update_tag(
-    tag_id: int, tag_in: JewelryTagUpdate, session: Session = Depends(get_db)
+    tag_id: int,
+    tag_in: JewelryTagUpdate,
+    session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
 ):
     tag = session.get(JewelryTag, tag_id)
     if not tag:
         raise HTTPException(404)
+    old_name = tag.name
     if tag_in.name:
         tag.name = tag_in.name.lower()
     session.add(tag)
     session.commit()
     session.refresh(tag)
+    index.rename_tag(old_name, tag.name)
     return tag
 
 
 @router.delete("/{tag_id}", status_code=204)
-def delete_tag(tag_id: int, session: Session = Depends(get_db)):
+def delete_tag(
+    tag_id: int,
+    session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
+):
     tag = session.get(JewelryTag, tag_id)
     if not tag:
         raise HTTPException(404)
+    name = tag.name
     session.delete(tag)
     session.commit()
+    index.remove_tag(name)
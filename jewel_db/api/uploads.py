@@ -0,0 +1,148 @@
+# jewel_db/api/uploads.py
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import inspect
+from sqlmodel import Session
+
+from jewel_db.api.items import ALLOWED_TYPES
+from jewel_db.api.jobs import read_jobs
+from jewel_db.core.dependencies import get_db, get_image_index
+from jewel_db.core.settings import settings
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.models.upload_session import UploadSession
+from jewel_db.schemas.image_job import ImageJobRead
+from jewel_db.schemas.upload_session import UploadSessionCreate, UploadSessionRead
+from jewel_db.services.image_index import ImageHashIndex
+from jewel_db.services.resumable_upload import (
+    UploadError,
+    append_chunk,
+    check_next,
+    complete,
+    create_session,
+    discard,
+    receive_chunk,
+    sweep_stale,
+)
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+MEDIA_DIR = Path(settings.media_dir)
+
+
+def _offset_headers(upload: UploadSession) -> dict[str, str]:
+    return {
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.size),
+        "Upload-Chunk": str(upload.chunks),
+    }
+
+
+def _get_upload(session: Session, upload_id: str) -> UploadSession:
+    upload = session.get(UploadSession, upload_id)
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+def _upload_error(exc: UploadError, upload: UploadSession) -> HTTPException:
+    # errors carry the offset to resume from, unless the upload was discarded
+    headers = None if inspect(upload).was_deleted else _offset_headers(upload)
+    return HTTPException(status_code=exc.status_code, detail=str(exc), headers=headers)
+
+
+@router.post("/", response_model=UploadSessionRead, status_code=201)
+def create_upload(
+    data: UploadSessionCreate,
+    response: Response,
+    session: Session = Depends(get_db),
+):
+    """Open a resumable upload of one image for an item."""
+    if data.content_type not in ALLOWED_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid image type")
+    if not session.get(JewelryItem, data.item_id):
+        raise HTTPException(status_code=404, detail="Item not found")
+    sweep_stale(session)
+    try:
+        upload = create_session(session, **data.model_dump(), media_dir=MEDIA_DIR)
+    except UploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc))
+    session.commit()
+    session.refresh(upload)
+    response.headers["Location"] = f"/api/uploads/{upload.id}"
+    response.headers.update(_offset_headers(upload))
+    return upload
+
+
+@router.head("/{upload_id}")
+def upload_offset(upload_id: str, session: Session = Depends(get_db)):
+    """Where to resume: ``Upload-Offset`` and the next ``Upload-Chunk``."""
+    upload = _get_upload(session, upload_id)
+    return Response(headers=_offset_headers(upload))
+
+
+@router.get("/{upload_id}", response_model=UploadSessionRead)
+def get_upload(upload_id: str, response: Response, session: Session = Depends(get_db)):
+    upload = _get_upload(session, upload_id)
+    response.headers.update(_offset_headers(upload))
+    return upload
+
+
+@router.put("/{upload_id}/chunks/{index}", status_code=204)
+async def put_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    chunk_sha256: str | None = Header(None, alias="X-Chunk-Sha256"),
+    session: Session = Depends(get_db),
+):
+    """
+    Append chunk *index* (the raw request body) at ``Upload-Offset``.
+    A mismatched offset or chunk number is a 409; ``HEAD`` tells the
+    client where to carry on.
+    """
+    # async only to stream the body; DB and disk work runs in the thread pool
+    upload = await run_in_threadpool(_get_upload, session, upload_id)
+    try:
+        check_next(upload, index=index, offset=upload_offset)
+        part = await receive_chunk(
+            upload, offset=upload_offset, body=request.stream(), sha256=chunk_sha256
+        )
+        await run_in_threadpool(
+            append_chunk, session, upload, part, index=index, offset=upload_offset
+        )
+    except UploadError as exc:
+        raise _upload_error(exc, upload)
+    return Response(status_code=204, headers=_offset_headers(upload))
+
+
+@router.post(
+    "/{upload_id}/complete",
+    response_model=ImageJobRead,
+    status_code=202,
+)
+def complete_upload(
+    upload_id: str,
+    session: Session = Depends(get_db),
+    hashes: ImageHashIndex = Depends(get_image_index),
+):
+    """
+    Verify the upload and queue it like a regular one; poll the returned
+    job (``GET /api/jobs/{id}``). Safe to repeat.
+    """
+    upload = _get_upload(session, upload_id)
+    if upload.status == "open" and not session.get(JewelryItem, upload.item_id):
+        discard(session, upload)
+        raise HTTPException(status_code=404, detail="Item not found")
+    try:
+        job = complete(session, upload, MEDIA_DIR)
+    except UploadError as exc:
+        raise _upload_error(exc, upload)
+    return read_jobs(session, hashes, [job])[0]
+
+
+@router.delete("/{upload_id}", status_code=204)
+def abort_upload(upload_id: str, session: Session = Depends(get_db)):
+    discard(session, _get_upload(session, upload_id))
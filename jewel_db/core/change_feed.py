@@ -0,0 +1,137 @@
+# jewel_db/core/change_feed.py
+"""
+Change feed for delta sync.
+
+Session flush hooks append one ``ChangeLog`` row per item, image or tag that
+was inserted, updated or deleted (deletes are kept as tombstones). Renaming or
+deleting a tag changes the embedded tag list of every item carrying it, so
+those items are logged too. Clients poll ``GET /api/changes?since=<seq>``
+and get only what moved after their last token.
+
+Writes that bypass the ORM unit of work (core ``UPDATE`` / ``DELETE``) must
+call ``record_changes`` themselves.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from jewel_db.models.change_log import ChangeLog
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.models.jewelry_tag import ItemTagLink, JewelryTag
+
+# (entity, entity_id, item_id, op); item_id is None for tags
+Change = tuple[str, int, int | None, str]
+
+_TAGGED_ITEMS = "change_feed.tagged_items"  # session.info key
+
+
+def record_changes(conn: Connection, changes: Iterable[Change]) -> None:
+    """Append *changes* to the feed (one executemany)."""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "entity": entity,
+            "entity_id": entity_id,
+            "item_id": item_id,
+            "op": op,
+            "changed_at": now,
+        }
+        for entity, entity_id, item_id, op in changes
+    ]
+    if rows:
+        conn.execute(insert(ChangeLog), rows)
+
+
+def touch_items(conn: Connection, item_ids: Iterable[int]) -> None:
+    """
+    Bump ``updated_at`` and ``version`` of items changed without a row
+    UPDATE of their own (a tag they carry was renamed or deleted).
+    """
+    ids = sorted(set(item_ids))
+    if ids:
+        conn.execute(
+            update(JewelryItem)
+            .where(JewelryItem.id.in_(ids))
+            .values(updated_at=datetime.utcnow(), version=JewelryItem.version + 1)
+        )
+
+
+# ── flush hooks ──────────────────────────────────────────────────────────
+def _tag_changed(tag: JewelryTag, session: Session) -> bool:
+    return tag in session.deleted or inspect(tag).attrs.name.history.has_changes()
+
+
+def _columns_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(
+        state.attrs[col.key].history.has_changes() for col in state.mapper.column_attrs
+    )
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    for item in session.dirty:
+        if (
+            isinstance(item, JewelryItem)
+            and session.is_modified(item)
+            and not _columns_changed(item)
+        ):
+            # tag-only change: force the row UPDATE (updated_at, version)
+            item.updated_at = datetime.utcnow()
+
+    # the link rows are gone after the flush, so collect the items now
+    tag_ids = [
+        tag.id
+        for tag in (*session.dirty, *session.deleted)
+        if isinstance(tag, JewelryTag) and tag.id and _tag_changed(tag, session)
+    ]
+    if not tag_ids:
+        return
+    with session.no_autoflush:
+        item_ids = session.execute(
+            select(ItemTagLink.item_id).where(ItemTagLink.tag_id.in_(tag_ids))
+        ).scalars()
+        session.info.setdefault(_TAGGED_ITEMS, set()).update(item_ids)
+
+
+def _entry(obj, op: str) -> Change | None:
+    if isinstance(obj, JewelryItem):
+        return ("item", obj.id, obj.id, op)
+    if isinstance(obj, JewelryImage):
+        return ("image", obj.id, obj.item_id, op)
+    if isinstance(obj, JewelryTag):
+        return ("tag", obj.id, None, op)
+    return None
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    changes: dict[tuple[str, int], Change] = {}
+    touched: set[int] = session.info.pop(_TAGGED_ITEMS, set())
+    for item_id in touched:
+        changes[("item", item_id)] = ("item", item_id, item_id, "upsert")
+    for obj in session.new:
+        if entry := _entry(obj, "upsert"):
+            changes[entry[:2]] = entry
+    for obj in session.dirty:
+        if session.is_modified(obj) and (entry := _entry(obj, "upsert")):
+            changes[entry[:2]] = entry
+    for obj in session.deleted:
+        if entry := _entry(obj, "delete"):
+            changes[entry[:2]] = entry
+    if changes:
+        conn = session.connection()
+        touch_items(conn, touched)  # deleted ids simply match no row
+        record_changes(conn, changes.values())
+
+
+def install_change_feed() -> None:
+    """Register the flush hooks on every ``Session`` (idempotent)."""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
@@ -0,0 +1,260 @@
+# jewel_db/core/compression.py
+"""
+Response compression.
+
+• ``CompressionMiddleware`` – on-the-fly gzip / brotli for text-like
+  responses (HTML, JSON, JS, CSS, SVG …), negotiated via Accept-Encoding.
+  Media that is already compressed (JPEG, WebP, PNG, archives) is passed
+  through untouched, as is anything below ``settings.compress_min_size``.
+• ``PrecompressedStaticFiles`` – serves ``<file>.br`` / ``<file>.gz``
+  siblings written at build time by ``precompress_tree`` so static assets
+  cost no CPU per request.
+
+Brotli is optional: without the ``brotli`` package only gzip is offered.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mimetypes
+import os
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from .settings import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/manifest+json",
+    "image/svg+xml",
+    "image/x-icon",
+    "image/vnd.microsoft.icon",
+)
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings this server can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, offered: tuple[str, ...]) -> list[str]:
+    """
+    Return the *offered* encodings the client accepts, best first.
+    Honours q-values (``q=0`` refuses); ties keep the server's preference.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    ranked = [(weights.get(enc, wildcard), -i, enc) for i, enc in enumerate(offered)]
+    return [enc for q, _, enc in sorted(ranked, reverse=True) if q > 0]
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    The strong tag of *etag*'s *encoding* variant: ``"item-2-1"`` →
+    ``"item-2-1-br"``. ``etags.etag_matches`` strips the suffix again.
+    """
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+# ── on-the-fly compression ───────────────────────────────────────────────
+class _Encoder:
+    """Streaming gzip / brotli encoder with a common interface."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=settings.brotli_quality)
+        else:
+            # wbits=31 → gzip container
+            self._gz = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + (self._br.finish() if final else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; buffers until the size threshold is known."""
+
+    def __init__(self, app, minimum_size: int | None = None) -> None:
+        self.app = app
+        self.minimum_size = (
+            settings.compress_min_size if minimum_size is None else minimum_size
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), supported_encodings()
+        )
+        if not accepted:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(send, accepted[0], self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    def __init__(self, send, encoding: str, minimum_size: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: dict | None = None
+        self.encoder: _Encoder | None = None
+        self.passthrough = False
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            if "content-encoding" in headers or not is_compressible(
+                headers.get("content-type", "")
+            ):
+                self.passthrough = True
+                await self.send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            self.start = message  # held back until we see the body
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not more_body and len(body) < self.minimum_size:
+                # small, complete body – not worth the CPU
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.encoder = _Encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            if etag := headers.get("etag"):
+                # a different byte representation of the same version
+                headers["ETag"] = encoded_etag(etag, self.encoding)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.encoder.compress(body, final=True)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self.start)
+
+        await self.send(
+            {
+                "type": "http.response.body",
+                "body": self.encoder.compress(body, final=not more_body),
+                "more_body": more_body,
+            }
+        )
+
+
+# ── precompressed static assets ──────────────────────────────────────────
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    ``StaticFiles`` that prefers an up-to-date ``.br`` / ``.gz`` sibling of
+    the requested file when the client accepts that encoding.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        for encoding in negotiate(accept, ("br", "gzip")):
+            variant = f"{full_path}{SUFFIXES[encoding]}"
+            try:
+                variant_stat = os.stat(variant)
+            except OSError:
+                continue
+            if variant_stat.st_mtime < stat_result.st_mtime:
+                continue  # stale build output – serve the source instead
+            media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+            response = FileResponse(
+                variant,
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=media_type,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+            if self.is_not_modified(response.headers, Headers(scope=scope)):
+                return NotModifiedResponse(response.headers)
+            return response
+        return super().file_response(full_path, stat_result, scope, status_code)
+
+
+def _compressible_file(path: Path) -> bool:
+    media_type = mimetypes.guess_type(path.name)[0] or ""
+    return is_compressible(media_type)
+
+
+def precompress_tree(
+    directory: str | Path, min_size: int | None = None
+) -> Iterator[tuple[Path, str, int, int]]:
+    """
+    Write ``.gz`` (and ``.br`` when available) siblings for every
+    compressible file under *directory* that is at least *min_size* bytes.
+    Variants that would not save at least 10 % are skipped; up-to-date ones
+    are left alone. Yields *(path, encoding, original size, compressed size)*.
+    """
+    min_size = settings.precompress_min_size if min_size is None else min_size
+    for path in sorted(Path(directory).rglob("*")):
+        if path.suffix in SUFFIXES.values() or not path.is_file():
+            continue
+        st = path.stat()
+        if st.st_size < min_size or not _compressible_file(path):
+            continue
+        raw = None
+        for encoding in supported_encodings():
+            target = path.with_name(path.name + SUFFIXES[encoding])
+            if target.exists() and target.stat().st_mtime >= st.st_mtime:
+                continue
+            raw = path.read_bytes() if raw is None else raw
+            if encoding == "br":
+                data = brotli.compress(raw, quality=11)
+            else:
+                data = gzip.compress(raw, compresslevel=9, mtime=0)
+            if len(data) > 0.9 * len(raw):
+                target.unlink(missing_ok=True)
+                continue
+            target.write_bytes(data)
+            yield path, encoding, len(raw), len(data)
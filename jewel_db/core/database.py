@@ -1,5 +1,7 @@
 from sqlmodel import Session, create_engine
 
+from .change_feed import install_change_feed
+from .query_log import install_slow_query_log
 from .settings import settings
 
 _engine = create_engine(
@@ -7,6 +9,8 @@ _engine = create_engine(
     echo=settings.debug,
     future=True,
 )
+install_slow_query_log(_engine)
+install_change_feed()
 
 
 def get_engine():
@@ -1,6 +1,10 @@
 from fastapi import Depends
 from sqlmodel import Session
 
+from jewel_db.services.analytics import ItemStats, item_stats
+from jewel_db.services.image_index import ImageHashIndex, image_index
+from jewel_db.services.tag_index import TagIndex, tag_index
+
 from .database import get_session
 from .settings import Settings, settings
 
@@ -11,3 +15,18 @@ def get_settings() -> Settings:
 
 def get_db(session: Session = Depends(get_session)) -> Session:  # re-export
     return session
+
+
+def get_image_index(session: Session = Depends(get_db)) -> ImageHashIndex:
+    image_index.ensure_fresh(session)
+    return image_index
+
+
+def get_item_stats(session: Session = Depends(get_db)) -> ItemStats:
+    item_stats.ensure_fresh(session)
+    return item_stats
+
+
+def get_tag_index(session: Session = Depends(get_db)) -> TagIndex:
+    tag_index.ensure_fresh(session)
+    return tag_index
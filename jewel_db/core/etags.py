@@ -0,0 +1,74 @@
+# jewel_db/core/etags.py
+"""
+Entity tags for conditional requests.
+
+Tags are derived from data that changes with the representation – an
+item's row ``version`` or the newest change-feed ``seq`` of a list – so
+they can be checked before anything else is loaded. ``CompressionMiddleware``
+gives compressed responses a strong tag of their own (``"item-2-1-br"``);
+comparisons drop that suffix, so any variant's tag satisfies ``If-Match``
+and ``If-None-Match`` for the version it was served with.
+"""
+
+from __future__ import annotations
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from jewel_db.core.compression import SUFFIXES
+from jewel_db.models.change_log import ChangeLog
+
+_ENCODING_SUFFIXES = tuple(f'-{encoding}"' for encoding in SUFFIXES)
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def _entity(tag: str) -> str:
+    """*tag* without the encoding suffix ``CompressionMiddleware`` adds."""
+    for suffix in _ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def matching_etag(header: str | None, etag: str, *, weak: bool = True) -> str | None:
+    """
+    The tag in an ``If-None-Match`` (weak) or ``If-Match`` (``weak=False``)
+    value that matches *etag* (or ``*``), else ``None``. Strong comparison
+    never matches a weak (``W/``) tag.
+    """
+    if not header:
+        return None
+    for tag in (t.strip() for t in header.split(",")):
+        if tag == "*":
+            return etag
+        if weak:
+            if _entity(tag.removeprefix("W/")) == _entity(etag.removeprefix("W/")):
+                return tag
+        elif not tag.startswith("W/") and _entity(tag) == _entity(etag):
+            return tag
+    return None
+
+
+def etag_matches(header: str | None, etag: str, *, weak: bool = True) -> bool:
+    """Whether *header* lists *etag*; see ``matching_etag``."""
+    return matching_etag(header, etag, weak=weak) is not None
+
+
+def last_change_seq(session: Session, entity: str, item_id: int | None = None) -> int:
+    """Newest change-feed seq for *entity* (of one item) – a list's version."""
+    stmt = select(func.max(ChangeLog.seq)).where(ChangeLog.entity == entity)
+    if item_id is not None:
+        stmt = stmt.where(ChangeLog.item_id == item_id)
+    return session.exec(stmt).one() or 0
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A bare 304 when the client's cached copy is current, else ``None``."""
+    # echo the client's tag: the variant it holds, as its 200 was tagged
+    if tag := matching_etag(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": tag})
+    return None
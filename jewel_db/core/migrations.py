@@ -0,0 +1,72 @@
+# jewel_db/core/migrations.py
+"""
+In-place schema upgrades for existing databases.
+
+``create_all`` only creates missing tables, so a column added to a model
+after its table already exists in a deployed ``jewel.db`` is listed in
+``ADDED_COLUMNS`` as well. ``upgrade_schema`` runs at startup (app and
+image workers) and adds whichever of them a table lacks.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+log = logging.getLogger(__name__)
+
+# table → {column: DDL}; add an entry whenever a model gains a column
+ADDED_COLUMNS: dict[str, dict[str, str]] = {
+    "jewelryimage": {
+        "phash": "VARCHAR",
+        "status": "VARCHAR NOT NULL DEFAULT 'ready'",
+    },
+    "jewelryitem": {
+        "updated_at": "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00.000000'",
+        "version": "INTEGER NOT NULL DEFAULT 1",
+    },
+}
+# run in the same transaction, right after ``table.column`` was added
+AFTER_ADD: dict[str, tuple[str, ...]] = {
+    "jewelryitem.updated_at": (
+        "UPDATE jewelryitem SET updated_at = created_at",
+        "CREATE INDEX IF NOT EXISTS ix_jewelryitem_updated_at"
+        " ON jewelryitem (updated_at)",
+    ),
+}
+
+
+def _columns(engine: Engine, table: str) -> set[str] | None:
+    """Column names of *table*, ``None`` if it does not exist."""
+    inspector = inspect(engine)
+    if not inspector.has_table(table):
+        return None
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade_schema(engine: Engine) -> list[str]:
+    """Add the missing ``ADDED_COLUMNS``; returns them as ``table.column``."""
+    added: list[str] = []
+    for table, columns in ADDED_COLUMNS.items():
+        present = _columns(engine, table)
+        if present is None:
+            continue  # created complete by create_all / migrations
+        for name, ddl in columns.items():
+            if name in present:
+                continue
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                    for statement in AFTER_ADD.get(f"{table}.{name}", ()):
+                        conn.execute(text(statement))
+            except OperationalError:
+                if name not in (_columns(engine, table) or ()):
+                    raise
+                continue  # another process added it first
+            added.append(f"{table}.{name}")
+    if added:
+        log.info("schema upgraded: added %s", ", ".join(added))
+    return added
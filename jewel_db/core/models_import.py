@@ -10,3 +10,6 @@ def import_models() -> None:
     import_module("jewel_db.models.jewelry_item")
     import_module("jewel_db.models.jewelry_tag")
     import_module("jewel_db.models.jewelry_image")
+    import_module("jewel_db.models.image_job")
+    import_module("jewel_db.models.change_log")
+    import_module("jewel_db.models.upload_session")
@@ -0,0 +1,167 @@
+# jewel_db/core/query_log.py
+"""
+Slow-query log hooked into the SQLAlchemy engine.
+
+Every statement slower than ``settings.slow_query_ms`` is recorded in a
+bounded ring buffer together with the *shape* of its bound parameters
+(types only, never values), the route that issued it and the database's
+query plan. Browse it through ``GET /api/admin/slow-queries`` (with the
+``X-Admin-Token`` set in ``settings.admin_token``).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .settings import settings
+
+# ASGI scope of the request currently being served (set by the middleware)
+_current_scope: ContextVar[dict | None] = ContextVar("_current_scope", default=None)
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    duration_ms: float
+    param_shape: list[str] | dict[str, str]
+    executemany: int
+    route: str | None
+    plan: list[str]
+    recorded_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of the most recent slow statements."""
+
+    def __init__(self, maxlen: int) -> None:
+        self._entries: deque[SlowQuery] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Newest first."""
+        with self._lock:
+            items = list(self._entries)
+        items.reverse()
+        return [asdict(e) for e in items[:limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(settings.slow_query_log_size)
+
+
+# ── helpers ──────────────────────────────────────────────────────────────
+def _shape(params: Any) -> tuple[list[str] | dict[str, str], int]:
+    """Return the parameter *types* (no values) and the executemany count."""
+    if (
+        isinstance(params, list | tuple)
+        and params
+        and isinstance(params[0], list | tuple | dict)
+    ):
+        first, count = params[0], len(params)
+    else:
+        first, count = params, 1
+    if isinstance(first, dict):
+        return {k: type(v).__name__ for k, v in first.items()}, count
+    return [type(v).__name__ for v in first or ()], count
+
+
+def _route() -> str | None:
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+def _explain(conn, statement: str, params: Any) -> list[str]:
+    """
+    Run EXPLAIN on a fresh DBAPI cursor so the engine events (and this
+    logger) are not re-entered.
+    """
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return []
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    if isinstance(params, list) and params and isinstance(params[0], list | tuple):
+        params = params[0]
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, params or ())
+        return [" ".join(str(col) for col in row) for row in cursor.fetchall()]
+    except Exception as exc:  # plan is best-effort, never break the query
+        return [f"<explain failed: {exc}>"]
+    finally:
+        cursor.close()
+
+
+# ── engine hooks ─────────────────────────────────────────────────────────
+def install_slow_query_log(
+    engine: Engine,
+    log: SlowQueryLog = slow_query_log,
+    threshold_ms: float | None = None,
+) -> None:
+    """Attach timing hooks to *engine*; statements over the threshold go to *log*."""
+    threshold = settings.slow_query_ms if threshold_ms is None else threshold_ms
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        # kept on the execution context, so a statement that raises leaves
+        # nothing behind on the pooled connection
+        context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_start", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < threshold:
+            return
+        shape, count = _shape(parameters)
+        log.record(
+            SlowQuery(
+                statement=statement,
+                duration_ms=round(duration_ms, 3),
+                param_shape=shape,
+                executemany=count,
+                route=_route(),
+                plan=(
+                    _explain(conn, statement, parameters)
+                    if settings.slow_query_explain
+                    else []
+                ),
+            )
+        )
+
+
+class RouteContextMiddleware:
+    """Pure ASGI middleware exposing the current request scope to the logger."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
@@ -6,11 +6,53 @@ class Settings(BaseSettings):
     debug: bool = False
     database_url: str = "sqlite:///./jewel.db"
     secret_key: str = "PLEASE_CHANGE_ME"  # used later for JWT / cookies
+    admin_token: str = ""  # X-Admin-Token for /api/admin; "" = disabled
 
     # ── upload/media ───────────────────────────────────────────────────────
     media_dir: str = "media"
     max_image_px: int = 1600
 
+    # ── image job queue ────────────────────────────────────────────────────
+    image_job_max_attempts: int = 5  # then the job (and image) is failed
+    image_job_retry_s: float = 5.0  # backoff base; doubles per attempt
+    image_job_lease_s: float = 300.0  # running jobs older than this are reclaimed
+    image_job_poll_s: float = 1.0  # idle worker sleep
+    bulk_upload_max_member: int = 50 * 1024 * 1024  # bytes per file in a ZIP
+    bulk_upload_batch: int = 200  # images committed per transaction
+
+    # ── resumable uploads ──────────────────────────────────────────────────
+    upload_max_size: int = 200 * 1024 * 1024  # bytes per image
+    upload_chunk_max: int = 16 * 1024 * 1024  # bytes per PUT
+    upload_session_ttl: float = 86400.0  # s of inactivity before a sweep
+    upload_sweep_s: float = 600.0  # how often image workers sweep them
+
+    # ── in-memory indexes ──────────────────────────────────────────────────
+    tag_index_ttl: float = 300.0  # s; reload to pick up other workers' writes
+    image_index_ttl: float = 300.0  # s; same, for the perceptual-hash index
+    duplicate_max_distance: int = 6  # bits; uploads this close are flagged
+    analytics_ttl: float = 3600.0  # s; full rebuild (changes apply per request)
+
+    # ── templates ──────────────────────────────────────────────────────────
+    template_cache_dir: str = ".jinja_cache"  # bytecode cache; "" disables it
+    fragment_cache_size: int = 2048  # rendered {% cache %} fragments kept
+
+    # ── compression ────────────────────────────────────────────────────────
+    compress_min_size: int = 500  # bytes; smaller responses are sent as-is
+    gzip_level: int = 6  # on-the-fly gzip (1-9)
+    brotli_quality: int = 4  # on-the-fly brotli (0-11); static assets use 11
+    precompress_min_size: int = 1024  # bytes; smaller static files are skipped
+
+    # ── backups ────────────────────────────────────────────────────────────
+    backup_pages_per_step: int = 1024  # pages copied per read lock
+    backup_step_pause_s: float = 0.005  # between steps, so writers get in
+    backup_gzip_level: int = 6  # archive compression (1-9)
+    backup_tmp_dir: str = ""  # where snapshots are staged; "" = system temp
+
+    # ── diagnostics ────────────────────────────────────────────────────────
+    slow_query_ms: float = 100.0  # statements slower than this are logged
+    slow_query_log_size: int = 200  # ring-buffer capacity
+    slow_query_explain: bool = True  # capture EXPLAIN (QUERY PLAN) output
+
     # ── model config ───────────────────────────────────────────────────────
     model_config = SettingsConfigDict(
         env_file=".env",
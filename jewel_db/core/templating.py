@@ -0,0 +1,112 @@
+# jewel_db/core/templating.py
+"""
+Shared Jinja2 environment.
+
+• Compiled templates are persisted with a ``FileSystemBytecodeCache`` so a
+  fresh worker loads bytecode instead of re-parsing every template.
+• ``{% cache "name", key, … %}…{% endcache %}`` memoises a rendered
+  fragment in a bounded in-process LRU. Put a version stamp in the key –
+  a new stamp simply misses and the stale entry ages out.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from .settings import settings
+
+TEMPLATE_DIR = "jewel_db/templates"
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered markup."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple, Markup] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Markup | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value: Markup) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FragmentCacheExtension(Extension):
+    """Adds the ``{% cache %}`` tag backed by ``environment.fragment_cache``."""
+
+    tags = {"cache"}
+
+    def __init__(self, environment: Environment) -> None:
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache(settings.fragment_cache_size))
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method(
+            "_render", [nodes.ContextReference(), nodes.List(parts)]
+        )
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, context, parts: list[Any], caller) -> Markup:
+        # url_for() renders absolute URLs, so fragments are cached per origin
+        request = context.get("request")
+        key = (str(request.base_url) if request else "", *parts)
+        cache: FragmentCache = self.environment.fragment_cache
+        html = cache.get(key)
+        if html is None:
+            html = Markup(caller())
+            cache.set(key, html)
+        return html
+
+
+def fragment_stamp(*values: Any) -> str:
+    """Short, stable version stamp for a fragment built from *values*."""
+    return hashlib.blake2b(repr(values).encode(), digest_size=8).hexdigest()
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache | None:
+    if not settings.template_cache_dir:
+        return None
+    directory = Path(settings.template_cache_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(str(directory))
+
+
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        bytecode_cache=_bytecode_cache(),
+        extensions=[FragmentCacheExtension],
+    )
+)
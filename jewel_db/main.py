@@ -6,22 +6,40 @@ from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from sqlalchemy import inspect
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, SQLModel, select
 
+from jewel_db.core.compression import CompressionMiddleware, PrecompressedStaticFiles
 from jewel_db.core.database import get_engine
-from jewel_db.core.dependencies import get_db
+from jewel_db.core.dependencies import get_db, get_tag_index
+from jewel_db.core.migrations import upgrade_schema
 from jewel_db.core.models_import import import_models
+from jewel_db.core.query_log import RouteContextMiddleware
 
 # Core infrastructure ----------------------------------------------------
 from jewel_db.core.settings import settings
+from jewel_db.core.templating import fragment_stamp, templates
+from jewel_db.services.analytics import item_stats
+from jewel_db.services.image_index import image_index
+from jewel_db.services.tag_index import (
+    TagExpressionError,
+    TagIndex,
+    tag_filter_clause,
+    tag_index,
+)
 
 # Routers ----------------------------------------------------------------
+from .api.admin import router as admin_router
+from .api.analytics import router as analytics_router
+from .api.changes import router as changes_router
 from .api.items import router as items_router
+from .api.jobs import router as jobs_router
 from .api.tags import router as tags_router
+from .api.uploads import router as uploads_router
 
 # ORM models (page queries) ----------------------------------------------
+from .models.change_log import ChangeLog
 from .models.jewelry_image import JewelryImage
 from .models.jewelry_item import JewelryItem
 from .models.jewelry_tag import JewelryTag
@@ -39,25 +57,48 @@ async def lifespan(app: FastAPI):
     if settings.debug and settings.database_url.startswith("sqlite"):
         import_models()  # discover ORM classes
         SQLModel.metadata.create_all(get_engine())  # idempotent
+    upgrade_schema(get_engine())  # columns added to existing tables
+    _warm_indexes()
     yield
     # (nothing on shutdown for now)
 
 
+def _warm_indexes() -> None:
+    """Build the in-memory indexes before the first request."""
+    with Session(get_engine()) as session:
+        tables = inspect(session.get_bind())
+        if tables.has_table(JewelryTag.__tablename__):
+            tag_index.load(session)
+        if tables.has_table(JewelryImage.__tablename__):
+            image_index.load(session)
+        if tables.has_table(ChangeLog.__tablename__):
+            item_stats.load(session)
+
+
 app = FastAPI(
     title="Jewelry Inventory System",
     debug=settings.debug,
     lifespan=lifespan,
 )
 
+# ── Middleware ───────────────────────────────────────────────────────────
+app.add_middleware(RouteContextMiddleware)  # tags slow queries with their route
+app.add_middleware(CompressionMiddleware)  # gzip / brotli for text responses
+
 # ── Static & media mounts ────────────────────────────────────────────────
-app.mount("/static", StaticFiles(directory="jewel_db/static"), name="static")
-app.mount("/media", StaticFiles(directory="media"), name="media")
+app.mount(
+    "/static", PrecompressedStaticFiles(directory="jewel_db/static"), name="static"
+)
+app.mount("/media", StaticFiles(directory=settings.media_dir), name="media")
 
 # ── API routers ──────────────────────────────────────────────────────────
 app.include_router(items_router, prefix="/api")
 app.include_router(tags_router, prefix="/api")
-
-templates = Jinja2Templates(directory="jewel_db/templates")
+app.include_router(jobs_router, prefix="/api")
+app.include_router(uploads_router, prefix="/api")
+app.include_router(changes_router, prefix="/api")
+app.include_router(analytics_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
 
 
 # ── Home ─────────────────────────────────────────────────────────────────
@@ -74,7 +115,9 @@ def list_items_page(
     search: str | None = None,
     material: str | None = None,
     gemstone: str | None = None,
+    tags: str | None = None,
     session: Session = Depends(get_db),
+    index: TagIndex = Depends(get_tag_index),
 ):
     # 1. Base query (eager-load tags)
     stmt = select(JewelryItem).options(selectinload(JewelryItem.tags))
@@ -88,6 +131,11 @@ def list_items_page(
             if gemstone == "None"
             else JewelryItem.gemstone == gemstone
         )
+    if tags:
+        try:
+            stmt = stmt.where(tag_filter_clause(index, tags))
+        except TagExpressionError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
 
     all_items = session.exec(stmt).all()
 
@@ -99,7 +147,16 @@ def list_items_page(
     items = all_items[start:end]
 
     # 3. Thumbnails
-    thumbs = {i.id: (i.images[0].url if i.images else None) for i in items}
+    thumbs = {
+        i.id: next((img.url for img in i.images if img.status == "ready"), None)
+        for i in items
+    }
+    stamps = {
+        i.id: fragment_stamp(
+            i.name, i.material, i.gemstone, i.weight, i.price, thumbs[i.id]
+        )
+        for i in items
+    }
 
     # 4. Stats
     avg_price = (
@@ -109,7 +166,14 @@ def list_items_page(
     total_weight = sum(i.weight or 0 for i in all_items)
     no_image_count = sum(1 for i in all_items if not i.images)
 
-    # 5. Filter values
+    # 5. Filter values (+ the active ones, for pagination links)
+    filters = {
+        "search": search,
+        "material": material,
+        "gemstone": gemstone,
+        "tags": tags,
+    }
+    filters = {k: v for k, v in filters.items() if v}
     materials = sorted({i.material for i in all_items if i.material})
     gemstones = sorted({i.gemstone for i in all_items if i.gemstone})
 
@@ -121,11 +185,14 @@ def list_items_page(
             "materials": materials,
             "gemstones": gemstones,
             "thumbs": thumbs,
+            "stamps": stamps,
             "page": page,
             "total_pages": total_pages,
             "search": search,
             "material": material,
             "gemstone": gemstone,
+            "tags": tags,
+            "filters": filters,
             "total_count": total_count,
             "avg_price": avg_price,
             "total_weight": total_weight,
@@ -1,6 +1,17 @@
 # jewel_db/models/__init__.py
+from .change_log import ChangeLog
+from .image_job import ImageJob
 from .jewelry_image import JewelryImage
 from .jewelry_item import JewelryItem
 from .jewelry_tag import ItemTagLink, JewelryTag
+from .upload_session import UploadSession
 
-__all__ = ["JewelryItem", "JewelryTag", "ItemTagLink", "JewelryImage"]
+__all__ = [
+    "JewelryItem",
+    "JewelryTag",
+    "ItemTagLink",
+    "JewelryImage",
+    "ImageJob",
+    "ChangeLog",
+    "UploadSession",
+]
@@ -0,0 +1,30 @@
+# jewel_db/models/change_log.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class ChangeLog(SQLModel, table=True):
+    """
+    Append-only feed of item / image / tag writes (see ``core/change_feed.py``).
+
+    ``seq`` is AUTOINCREMENT so a number is never reused, even after the
+    newest row is deleted – clients use it as their sync token.
+    """
+
+    __table_args__ = (
+        # latest change per entity kind / per item (ETags)
+        Index("ix_changelog_entity_seq", "entity", "seq"),
+        Index("ix_changelog_item_entity_seq", "item_id", "entity", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: int | None = Field(default=None, primary_key=True)
+    entity: str  # item | image | tag
+    entity_id: int
+    item_id: int | None  # the item itself, the image's owner; None for tags
+    op: str  # upsert | delete (tombstone)
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
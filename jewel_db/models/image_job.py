@@ -0,0 +1,30 @@
+# jewel_db/models/image_job.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class ImageJob(SQLModel, table=True):
+    """
+    One queued normalisation of a raw upload into its ``JewelryImage``.
+
+    No foreign key on ``image_id``: a job may outlive an image deleted
+    while it was queued – the worker then cancels it.
+    """
+
+    id: int | None = Field(default=None, primary_key=True)
+    image_id: int = Field(index=True)
+    source_path: str  # raw upload, removed once processed
+    target_path: str  # final file under media/, matches JewelryImage.url
+    content_type: str
+    status: str = Field(default="queued", index=True)
+    # queued | running | done | failed | cancelled
+    attempts: int = 0
+    error: str | None = None
+    available_at: datetime = Field(default_factory=datetime.utcnow)  # retry backoff
+    locked_by: str | None = None
+    locked_at: datetime | None = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
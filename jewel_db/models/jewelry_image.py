@@ -15,6 +15,10 @@ class JewelryImageBase(SQLModel):
     url: str
     sort_order: int = 0
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
+    phash: str | None = Field(default=None, description="64-bit dHash, hex")
+    status: str = Field(
+        default="ready", description="pending | ready | failed (see ImageJob)"
+    )
 
 
 class JewelryImage(JewelryImageBase, table=True):
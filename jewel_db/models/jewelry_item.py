@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from sqlalchemy import Column, Integer
 from sqlalchemy.orm import relationship
 from sqlmodel import Field, Relationship, SQLModel
 
@@ -20,10 +21,26 @@ class JewelryItemBase(SQLModel):
     description: str | None = None
     sort_order: int | None = 9999
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        index=True,
+        sa_column_kwargs={"onupdate": datetime.utcnow},
+    )
+
+
+# row version: every ORM UPDATE checks and bumps it (optimistic locking, ETags)
+_version = Column("version", Integer, nullable=False, default=1)
 
 
 class JewelryItem(JewelryItemBase, table=True):
+    # AUTOINCREMENT: an id is never reused after a delete, so ETags
+    # (``"item-{id}-{version}"``) cannot collide with a deleted item's
+    __table_args__ = {"sqlite_autoincrement": True}
+
     id: int | None = Field(default=None, primary_key=True)
+    version: int = Field(default=1, sa_column=_version)
+
+    __mapper_args__ = {"version_id_col": _version}
 
     images: list[JewelryImage] = Relationship(
         sa_relationship=relationship(
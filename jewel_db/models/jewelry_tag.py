@@ -31,6 +31,7 @@ class JewelryTag(JewelryTagBase, table=True):
             "JewelryItem",
             secondary="itemtaglink",
             back_populates="tags",
+            collection_class=list,  # "list[JewelryItem]" is unresolvable here
         ),
         link_model=ItemTagLink,
     )
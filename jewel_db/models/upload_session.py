@@ -0,0 +1,28 @@
+# jewel_db/models/upload_session.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class UploadSession(SQLModel, table=True):
+    """
+    A resumable upload of one large image: chunks are appended to
+    ``path`` until ``offset`` reaches ``size``, then the file is handed to
+    the image job queue. Like ``ImageJob``, no foreign key on ``item_id``.
+    """
+
+    id: str = Field(primary_key=True)  # uuid4 hex, unguessable
+    item_id: int = Field(index=True)
+    filename: str
+    content_type: str
+    size: int  # declared total, in bytes
+    sha256: str | None = None  # whole-file digest, checked on completion
+    path: str  # spool file, moved to the job queue on completion
+    offset: int = 0  # bytes received
+    chunks: int = 0  # chunks received; the next PUT is chunk number ``chunks``
+    status: str = "open"  # open | complete
+    job_id: int | None = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
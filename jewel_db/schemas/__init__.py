@@ -1,11 +1,51 @@
-from .jewelry_item import JewelryItemCreate, JewelryItemRead, JewelryItemUpdate
-from .jewelry_tag import JewelryTagCreate, JewelryTagRead, JewelryTagUpdate
+from .analytics import AnalyticsRead, Distribution, GroupStat, Histogram, Outlier
+from .change_log import ChangeFeed, ChangeRead
+from .image_job import BulkUploadReport, BulkUploadResult, ImageJobRead
+from .jewelry_image import SimilarImage
+from .jewelry_item import (
+    BatchItemResult,
+    BatchUpdateReport,
+    ItemFieldExpression,
+    ItemFilter,
+    JewelryItemBatchPatch,
+    JewelryItemBatchUpdate,
+    JewelryItemCreate,
+    JewelryItemRead,
+    JewelryItemUpdate,
+)
+from .jewelry_tag import (
+    JewelryTagCreate,
+    JewelryTagRead,
+    JewelryTagSuggestion,
+    JewelryTagUpdate,
+)
+from .upload_session import UploadSessionCreate, UploadSessionRead
 
 __all__ = [
+    "AnalyticsRead",
+    "Distribution",
+    "GroupStat",
+    "Histogram",
+    "Outlier",
+    "ChangeFeed",
+    "ChangeRead",
+    "BulkUploadReport",
+    "BulkUploadResult",
+    "ImageJobRead",
+    "SimilarImage",
+    "BatchItemResult",
+    "BatchUpdateReport",
+    "ItemFieldExpression",
+    "ItemFilter",
+    "JewelryItemBatchPatch",
+    "JewelryItemBatchUpdate",
     "JewelryItemCreate",
     "JewelryItemUpdate",
     "JewelryItemRead",
     "JewelryTagCreate",
     "JewelryTagUpdate",
     "JewelryTagRead",
+    "JewelryTagSuggestion",
+    "UploadSessionCreate",
+    "UploadSessionRead",
 ]
@@ -0,0 +1,42 @@
+# jewel_db/schemas/analytics.py
+from sqlmodel import SQLModel
+
+
+class Histogram(SQLModel):
+    edges: list[float]  # len(counts) + 1 bin edges
+    counts: list[int]
+
+
+class Distribution(SQLModel):
+    count: int  # items with a value
+    mean: float | None = None
+    min: float | None = None
+    max: float | None = None
+    percentiles: dict[str, float] = {}  # p5, p25, p50, p75, p95
+    histogram: Histogram | None = None
+
+
+class GroupStat(SQLModel):
+    key: str  # material / gemstone ("none" when unset)
+    count: int
+    mean_price_per_gram: float
+    median_price_per_gram: float
+
+
+class Outlier(SQLModel):
+    item_id: int
+    material: str
+    price: float
+    weight: float
+    price_per_gram: float
+    expected_low: float  # Tukey fences of the item's material
+    expected_high: float
+
+
+class AnalyticsRead(SQLModel):
+    items: int
+    price: Distribution
+    weight: Distribution
+    price_per_gram_by_material: list[GroupStat]
+    price_per_gram_by_gemstone: list[GroupStat]
+    outliers: list[Outlier]  # most extreme first
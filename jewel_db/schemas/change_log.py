@@ -0,0 +1,27 @@
+# jewel_db/schemas/change_log.py
+from datetime import datetime
+
+from sqlmodel import SQLModel
+
+from jewel_db.models.jewelry_image import JewelryImage
+
+from .jewelry_item import JewelryItemRead
+from .jewelry_tag import JewelryTagRead
+
+
+class ChangeRead(SQLModel):
+    seq: int
+    entity: str  # item | image | tag
+    entity_id: int
+    item_id: int | None
+    op: str  # upsert | delete
+    changed_at: datetime
+    item: JewelryItemRead | None = None  # current state, for item upserts
+    image: JewelryImage | None = None  # current state, for image upserts
+    tag: JewelryTagRead | None = None  # current state, for tag upserts
+
+
+class ChangeFeed(SQLModel):
+    changes: list[ChangeRead]
+    next: int  # pass back as ?since= on the next poll
+    has_more: bool  # another page is already waiting
@@ -0,0 +1,33 @@
+# jewel_db/schemas/image_job.py
+from datetime import datetime
+
+from sqlmodel import SQLModel
+
+from .jewelry_image import SimilarImage
+
+
+class ImageJobRead(SQLModel):
+    id: int
+    image_id: int
+    status: str  # queued | running | done | failed | cancelled
+    attempts: int
+    error: str | None
+    created_at: datetime
+    finished_at: datetime | None
+    image_url: str | None = None
+    image_status: str | None = None  # pending | ready | failed
+    duplicates: list[SimilarImage] = []  # filled in once the image is ready
+
+
+class BulkUploadResult(SQLModel):
+    filename: str
+    status: str  # queued | skipped | unmatched | rejected | error
+    item_id: int | None = None
+    job_id: int | None = None  # poll GET /api/jobs/{job_id}
+    detail: str | None = None
+
+
+class BulkUploadReport(SQLModel):
+    queued: int
+    not_queued: int
+    results: list[BulkUploadResult]
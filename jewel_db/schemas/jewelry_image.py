@@ -0,0 +1,8 @@
+# jewel_db/schemas/jewelry_image.py
+from sqlmodel import SQLModel
+
+
+class SimilarImage(SQLModel):
+    image_id: int
+    item_id: int
+    distance: int  # Hamming distance between perceptual hashes (0–64)
@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Literal
 
-from pydantic import field_validator
+from pydantic import field_validator, model_validator
 from sqlmodel import Field, SQLModel
 
 from .jewelry_tag import JewelryTagRead  # noqa: E402
@@ -59,4 +60,53 @@ class JewelryItemRead(SQLModel):
     description: str | None
     sort_order: int | None
     created_at: datetime
+    updated_at: datetime
     tags: list[JewelryTagRead] = []
+
+
+# ── batch updates ────────────────────────────────────────────────────────
+class JewelryItemBatchUpdate(JewelryItemUpdate):
+    id: int
+
+
+class ItemFilter(SQLModel):
+    ids: list[int] | None = None
+    material: str | None = None
+    gemstone: str | None = None
+    category: str | None = None
+    tags: str | None = None  # tag expression, e.g. "gold AND NOT ring"
+    all: bool = False  # required to match every item when nothing else is set
+
+
+class ItemFieldExpression(SQLModel):
+    field: str
+    op: Literal["set", "mul", "add"] = "set"
+    value: float | str | None = None
+    round: int | None = None  # decimals, for mul / add
+
+
+class JewelryItemBatchPatch(SQLModel):
+    """Either ``items`` (per-item payloads) or ``filter`` + ``set``."""
+
+    items: list[JewelryItemBatchUpdate] | None = None
+    filter: ItemFilter | None = None
+    set: list[ItemFieldExpression] | None = None
+
+    @model_validator(mode="after")
+    def _one_mode(self):
+        if (self.items is None) == (self.filter is None):
+            raise ValueError("give either `items` or `filter`")
+        if self.filter is not None and not self.set:
+            raise ValueError("`filter` needs at least one `set` expression")
+        return self
+
+
+class BatchItemResult(SQLModel):
+    id: int
+    status: str  # updated | not_found
+    detail: str | None = None
+
+
+class BatchUpdateReport(SQLModel):
+    updated: int
+    results: list[BatchItemResult]
@@ -16,3 +16,8 @@ class JewelryTagUpdate(SQLModel):
 
 class JewelryTagRead(JewelryTagBase):
     id: int
+
+
+class JewelryTagSuggestion(SQLModel):
+    name: str
+    count: int = Field(description="number of items carrying the tag")
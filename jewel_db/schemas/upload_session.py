@@ -0,0 +1,34 @@
+# jewel_db/schemas/upload_session.py
+import re
+from datetime import datetime
+
+from pydantic import field_validator
+from sqlmodel import Field, SQLModel
+
+
+class UploadSessionCreate(SQLModel):
+    item_id: int
+    filename: str
+    content_type: str
+    size: int = Field(gt=0)  # bytes
+    sha256: str | None = None  # hex digest of the whole file
+
+    @field_validator("sha256")
+    def _hex_digest(cls, v: str | None):
+        if v is not None and not re.fullmatch(r"[0-9a-fA-F]{64}", v):
+            raise ValueError("sha256 must be 64 hex digits")
+        return v.lower() if v else v
+
+
+class UploadSessionRead(SQLModel):
+    id: str
+    item_id: int
+    filename: str
+    content_type: str
+    size: int
+    offset: int  # bytes received; resume from here
+    chunks: int  # number of the next chunk
+    status: str  # open | complete
+    job_id: int | None  # poll GET /api/jobs/{job_id} once complete
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,305 @@
+"""
+Columnar price / weight analytics.
+
+``price``, ``weight``, ``material`` and ``gemstone`` of every item are kept
+in NumPy arrays (the two text columns as integer category codes), so the
+statistics behind ``GET /api/analytics`` are a handful of vectorised passes
+rather than a scan through ORM objects – a few milliseconds at 100k items.
+
+The arrays follow the change feed: each request applies the item changes
+logged since the last one (usually none), and ``settings.analytics_ttl``
+forces a full rebuild now and then.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import bindparam, func
+from sqlmodel import Session, select
+
+from jewel_db.core.settings import settings
+from jewel_db.models.change_log import ChangeLog
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.schemas.analytics import (
+    AnalyticsRead,
+    Distribution,
+    GroupStat,
+    Histogram,
+    Outlier,
+)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+_COLUMNS = (
+    JewelryItem.id,
+    JewelryItem.price,
+    JewelryItem.weight,
+    JewelryItem.material,
+    JewelryItem.gemstone,
+)
+
+
+class _Categories:
+    """Label ↔ integer code mapping; ``None`` is shown as ``"none"``."""
+
+    def __init__(self) -> None:
+        self.labels: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def code(self, label: str | None) -> int:
+        label = label or "none"
+        if label not in self._codes:
+            self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return self._codes[label]
+
+
+class ItemStats:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._reset(0)
+        self.loaded_at: float | None = None
+        self.seq = 0  # last change-feed entry applied
+
+    def _reset(self, capacity: int) -> None:
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._price = np.empty(capacity, dtype=np.float64)
+        self._weight = np.empty(capacity, dtype=np.float64)
+        self._material = np.empty(capacity, dtype=np.int32)
+        self._gemstone = np.empty(capacity, dtype=np.int32)
+        self._materials = _Categories()
+        self._gemstones = _Categories()
+        self._pos: dict[int, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ── (re)loading ──────────────────────────────────────────────────────
+    def load(self, session: Session) -> None:
+        """Rebuild from every item."""
+        seq = session.exec(select(func.max(ChangeLog.seq))).one() or 0
+        rows = session.exec(select(*_COLUMNS)).all()
+        n = len(rows)
+        with self._lock:
+            self._reset(max(1024, n))
+            # None → NaN in a float64 array
+            self._ids[:n] = [r[0] for r in rows]
+            self._price[:n] = np.array([r[1] for r in rows], dtype=np.float64)
+            self._weight[:n] = np.array([r[2] for r in rows], dtype=np.float64)
+            self._material[:n] = [self._materials.code(r[3]) for r in rows]
+            self._gemstone[:n] = [self._gemstones.code(r[4]) for r in rows]
+            self._pos = {r[0]: i for i, r in enumerate(rows)}
+            self._size = n
+            self.seq = seq
+            self.loaded_at = time.monotonic()
+
+    def ensure_fresh(self, session: Session) -> None:
+        """Full load on first use / after the TTL, else apply new changes."""
+        if (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > settings.analytics_ttl
+        ):
+            self.load(session)
+            return
+        changes = session.exec(
+            select(ChangeLog.seq, ChangeLog.entity_id, ChangeLog.op)
+            .where(ChangeLog.seq > self.seq, ChangeLog.entity == "item")
+            .order_by(ChangeLog.seq)
+        ).all()
+        if not changes:
+            return
+        latest = {entity_id: op for _seq, entity_id, op in changes}
+        upserted = [i for i, op in latest.items() if op == "upsert"]
+        rows = session.exec(
+            select(*_COLUMNS).where(
+                JewelryItem.id.in_(
+                    bindparam("ids", upserted, expanding=True, literal_execute=True)
+                )
+            )
+        )
+        with self._lock:
+            self._remove([i for i, op in latest.items() if op == "delete"])
+            self._upsert(rows.all())
+            self.seq = max(self.seq, changes[-1][0])
+
+    # ── writes ───────────────────────────────────────────────────────────
+    def _upsert(self, rows) -> None:
+        for item_id, price, weight, material, gemstone in rows:
+            n = self._pos.get(item_id)
+            if n is None:
+                if self._size == len(self._ids):  # grow ×2
+                    capacity = max(1024, 2 * self._size)
+                    for name in ("_ids", "_price", "_weight", "_material", "_gemstone"):
+                        setattr(self, name, np.resize(getattr(self, name), capacity))
+                n = self._pos[item_id] = self._size
+                self._size += 1
+            self._ids[n] = item_id
+            self._price[n] = np.nan if price is None else price
+            self._weight[n] = np.nan if weight is None else weight
+            self._material[n] = self._materials.code(material)
+            self._gemstone[n] = self._gemstones.code(gemstone)
+
+    def _remove(self, item_ids: list[int]) -> None:
+        for item_id in item_ids:
+            n = self._pos.pop(item_id, None)
+            if n is None:
+                continue
+            last = self._size - 1
+            if n != last:  # move the last entry into the hole
+                for arr in (
+                    self._ids,
+                    self._price,
+                    self._weight,
+                    self._material,
+                    self._gemstone,
+                ):
+                    arr[n] = arr[last]
+                self._pos[int(self._ids[n])] = n
+            self._size = last
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def summary(
+        self, bins: int = 20, outlier_k: float = 1.5, outlier_limit: int = 50
+    ) -> AnalyticsRead:
+        with self._lock:
+            n = self._size
+            ids = self._ids[:n].copy()
+            price, weight = self._price[:n].copy(), self._weight[:n].copy()
+            material, gemstone = self._material[:n].copy(), self._gemstone[:n].copy()
+            materials = list(self._materials.labels)
+            gemstones = list(self._gemstones.labels)
+
+        priced = np.isfinite(price) & np.isfinite(weight) & (weight > 0)
+        ppg = np.full(n, np.nan)
+        ppg[priced] = price[priced] / weight[priced]
+        order = np.flatnonzero(priced)[np.argsort(ppg[priced])]  # one float sort
+        by_material = _group_by(ppg[order], material[order])
+        return AnalyticsRead(
+            items=n,
+            price=_distribution(price, bins),
+            weight=_distribution(weight, bins),
+            price_per_gram_by_material=_group_stats(by_material, materials),
+            price_per_gram_by_gemstone=_group_stats(
+                _group_by(ppg[order], gemstone[order]), gemstones
+            ),
+            outliers=_outliers(
+                ids,
+                price,
+                weight,
+                ppg,
+                material,
+                materials,
+                by_material,
+                outlier_k,
+                outlier_limit,
+            ),
+        )
+
+
+def _quantiles(
+    sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float
+) -> np.ndarray:
+    """Quantile *q* (linear interpolation) of each sorted run of values."""
+    pos = starts + q * (counts - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, starts + counts - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _distribution(values: np.ndarray, bins: int) -> Distribution:
+    values = np.sort(values[np.isfinite(values)])
+    n = len(values)
+    if not n:
+        return Distribution(count=0)
+    counts, edges = np.histogram(values, bins=bins)
+    whole = (np.zeros(1, dtype=np.int64), np.array([n]))
+    return Distribution(
+        count=n,
+        mean=float(values.mean()),
+        min=float(values[0]),
+        max=float(values[-1]),
+        percentiles={
+            f"p{p}": float(_quantiles(values, *whole, p / 100)[0]) for p in PERCENTILES
+        },
+        histogram=Histogram(edges=edges.tolist(), counts=counts.tolist()),
+    )
+
+
+class _Groups(NamedTuple):
+    codes: np.ndarray  # category codes that have at least one value
+    counts: np.ndarray
+    means: np.ndarray
+    quartiles: np.ndarray  # (len(codes), 3): q1, median, q3
+
+
+def _group_by(sorted_values: np.ndarray, codes: np.ndarray) -> _Groups:
+    """
+    Count, mean and quartiles per category of *sorted_values* (ascending,
+    finite; *codes* aligned with them). A stable sort by code keeps every
+    group's run sorted, so quartiles are plain lookups.
+    """
+    keys = codes.astype(np.uint16) if codes.size and codes.max() < 1 << 16 else codes
+    order = np.argsort(keys, kind="stable")  # radix sort for 16-bit keys
+    values = sorted_values[order]
+    counts = np.bincount(codes)
+    present = np.flatnonzero(counts)
+    counts = counts[present]
+    starts = np.cumsum(counts) - counts
+    if not len(values):
+        return _Groups(present, counts, np.empty(0), np.empty((0, 3)))
+    return _Groups(
+        present,
+        counts,
+        np.add.reduceat(values, starts) / counts,
+        np.column_stack(
+            [_quantiles(values, starts, counts, q) for q in (0.25, 0.5, 0.75)]
+        ),
+    )
+
+
+def _group_stats(groups: _Groups, labels: list[str]) -> list[GroupStat]:
+    stats = [
+        GroupStat(
+            key=labels[code],
+            count=int(count),
+            mean_price_per_gram=float(mean),
+            median_price_per_gram=float(quartiles[1]),
+        )
+        for code, count, mean, quartiles in zip(*groups, strict=True)
+    ]
+    return sorted(stats, key=lambda s: -s.count)
+
+
+def _outliers(
+    ids, price, weight, ppg, material, labels, groups: _Groups, k: float, limit: int
+) -> list[Outlier]:
+    """Tukey fences (``k`` × IQR) on price per gram within each material."""
+    q1, q3 = groups.quartiles[:, 0], groups.quartiles[:, 2]
+    low_by_code = np.full(len(labels), -np.inf)
+    high_by_code = np.full(len(labels), np.inf)
+    low_by_code[groups.codes] = q1 - k * (q3 - q1)
+    high_by_code[groups.codes] = q3 + k * (q3 - q1)
+
+    low, high = low_by_code[material], high_by_code[material]
+    distance = np.maximum(low - ppg, ppg - high)  # NaN (no price per gram) → False
+    hits = np.flatnonzero(distance > 0)
+    hits = hits[np.argsort(-distance[hits], kind="stable")[:limit]]
+    return [
+        Outlier(
+            item_id=int(ids[i]),
+            material=labels[material[i]],
+            price=float(price[i]),
+            weight=float(weight[i]),
+            price_per_gram=float(ppg[i]),
+            expected_low=float(low[i]),
+            expected_high=float(high[i]),
+        )
+        for i in hits
+    ]
+
+
+item_stats = ItemStats()
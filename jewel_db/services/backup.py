@@ -0,0 +1,220 @@
+"""
+Online backup.
+
+``snapshot`` copies the live SQLite database with the online backup API,
+``settings.backup_pages_per_step`` pages at a time. The source is only
+read-locked while a step runs, and each step is followed by a short pause
+so writers get in; a write from another connection makes SQLite restart
+the copy, so the result is always a consistent snapshot, never a torn file.
+Step times are recorded, which gives the longest and total lock hold.
+
+``stream_archive`` turns a snapshot (plus, optionally, the published
+images under ``media/``) into a ``.tar.gz`` produced chunk by chunk, so
+neither the archive nor the compressed data is ever held in memory.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import sqlite3
+import tarfile
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy.engine import Engine
+
+from jewel_db.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class BackupNotSupported(RuntimeError):
+    """The database is not SQLite."""
+
+
+@dataclass
+class BackupStats:
+    pages: int = 0
+    page_size: int = 0
+    steps: int = 0
+    restarts: int = 0  # a concurrent write made SQLite start over
+    seconds: float = 0.0
+    lock_total_ms: float = 0.0  # time the source was read-locked
+    lock_max_ms: float = 0.0  # longest single step
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def size(self) -> int:
+        return self.pages * self.page_size
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return self.size / 1e6 / self.seconds if self.seconds else 0.0
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "X-Backup-Bytes": str(self.size),
+            "X-Backup-Steps": str(self.steps),
+            "X-Backup-Seconds": f"{self.seconds:.3f}",
+            "X-Backup-Throughput-MBps": f"{self.throughput_mb_s:.1f}",
+            "X-Backup-Lock-Total-Ms": f"{self.lock_total_ms:.1f}",
+            "X-Backup-Lock-Max-Ms": f"{self.lock_max_ms:.1f}",
+        }
+
+
+def snapshot(engine: Engine, target: Path) -> BackupStats:
+    """
+    Copy the database behind *engine* to *target* without blocking writers.
+    Raises ``BackupNotSupported`` for anything but SQLite.
+    """
+    if engine.dialect.name != "sqlite":
+        raise BackupNotSupported(f"Online backup needs SQLite, not {engine.name}")
+    stats = BackupStats()
+    last = [0, 0.0]  # remaining pages, end of the last pause
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        held = (time.perf_counter() - last[1]) * 1000
+        stats.steps += 1
+        stats.lock_total_ms += held
+        stats.lock_max_ms = max(stats.lock_max_ms, held)
+        if remaining > last[0] and stats.steps > 1:
+            stats.restarts += 1
+        last[0] = remaining
+        stats.pages = total
+        if remaining:
+            time.sleep(settings.backup_step_pause_s)  # let writers in
+        last[1] = time.perf_counter()
+
+    raw = engine.raw_connection()
+    started = time.perf_counter()
+    try:
+        source = raw.driver_connection
+        stats.page_size = source.execute("PRAGMA page_size").fetchone()[0]
+        dest = sqlite3.connect(target)
+        try:
+            last[1] = time.perf_counter()
+            source.backup(dest, pages=settings.backup_pages_per_step, progress=progress)
+        finally:
+            dest.close()
+    finally:
+        raw.close()
+    stats.seconds = time.perf_counter() - started
+    log.info("database backup: %s", stats.headers())
+    return stats
+
+
+# ── archive ──────────────────────────────────────────────────────────────
+class _QueueWriter(io.RawIOBase):
+    """File object handing every write to the consumer through a queue."""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event) -> None:
+        self._chunks = chunks
+        self._cancelled = cancelled
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        while True:
+            if self._cancelled.is_set():
+                raise BrokenPipeError("backup download cancelled")
+            try:
+                self._chunks.put(bytes(data), timeout=0.5)
+                return len(data)
+            except queue.Full:
+                continue
+
+
+def _media_files(media_dir: Path) -> Iterator[Path]:
+    """Published images only – not the spools of queued or partial uploads."""
+    for path in sorted(media_dir.iterdir()):
+        if path.is_file() and not path.name.startswith("."):
+            yield path
+
+
+def _write_archive(
+    out: BinaryIO,
+    database: Path,
+    db_name: str,
+    stats: BackupStats,
+    media_dir: Path | None,
+) -> None:
+    with (
+        gzip.GzipFile(
+            fileobj=out, mode="wb", compresslevel=settings.backup_gzip_level
+        ) as gz,
+        tarfile.open(fileobj=gz, mode="w|") as tar,
+    ):
+        tar.add(database, arcname=db_name)
+        manifest = json.dumps(
+            {**asdict(stats), "bytes": stats.size}, default=str, indent=2
+        ).encode()
+        info = tarfile.TarInfo("backup.json")
+        info.size, info.mtime = len(manifest), int(time.time())
+        tar.addfile(info, io.BytesIO(manifest))
+        if media_dir is not None:
+            for path in _media_files(media_dir):
+                tar.add(path, arcname=f"media/{path.name}")
+
+
+def stream_archive(
+    database: Path,
+    stats: BackupStats,
+    *,
+    db_name: str = "jewel.db",
+    media_dir: Path | None = None,
+) -> Iterator[bytes]:
+    """
+    Yield a ``.tar.gz`` of the snapshot *database* (deleted afterwards), a
+    ``backup.json`` with *stats* and, if given, the files in *media_dir*.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=16)  # ≤ 1 MB in flight
+    cancelled = threading.Event()
+
+    def produce() -> None:
+        try:
+            raw = _QueueWriter(chunks, cancelled)
+            with io.BufferedWriter(raw, buffer_size=64 * 1024) as out:
+                _write_archive(out, database, db_name, stats, media_dir)
+            result = _DONE
+        except BaseException as exc:  # handed to the consumer
+            result = exc
+        finally:
+            database.unlink(missing_ok=True)
+        while not cancelled.is_set():
+            try:
+                chunks.put(result, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    threading.Thread(target=produce, name="backup-archive", daemon=True).start()
+    try:
+        while (chunk := chunks.get()) is not _DONE:
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield chunk
+    finally:
+        cancelled.set()  # the client went away: stop the producer
+
+
+def snapshot_path() -> Path:
+    """A fresh temporary file for a snapshot (the caller removes it)."""
+    fd, name = tempfile.mkstemp(
+        prefix="jewel-backup-", suffix=".db", dir=settings.backup_tmp_dir or None
+    )
+    os.close(fd)
+    return Path(name)
@@ -0,0 +1,231 @@
+"""
+Set-based item updates.
+
+Mass edits (repricing after a metal-price move, re-tagging a collection)
+run as a handful of SQL statements in one transaction instead of one
+load / commit / re-select round trip per item:
+
+• ``update_items`` – per-item partial payloads, sent as an executemany
+  ``UPDATE … WHERE id = ?`` grouped by the set of fields each row changes;
+  tags are replaced with one ``DELETE`` and one ``INSERT`` on the link table.
+• ``update_matching`` – one ``UPDATE … WHERE <filter> RETURNING id`` with
+  column expressions such as ``price = round(price * 1.04, 2)``.
+
+No ORM objects are loaded, so the session flush hooks never see these
+writes; both functions log to the change feed themselves. The caller
+commits.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, bindparam, delete, func, insert, update
+from sqlmodel import Session, select
+
+from jewel_db.core.change_feed import record_changes
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.models.jewelry_tag import ItemTagLink, JewelryTag
+from jewel_db.schemas.jewelry_item import (
+    BatchItemResult,
+    ItemFieldExpression,
+    ItemFilter,
+    JewelryItemBatchUpdate,
+)
+from jewel_db.services.tag_index import TagIndex, tag_filter_clause
+
+UPDATABLE_FIELDS = (
+    "name",
+    "category",
+    "material",
+    "gemstone",
+    "weight",
+    "price",
+    "description",
+)
+NUMERIC_FIELDS = {"weight", "price"}
+
+
+class BatchUpdateError(ValueError):
+    """Raised for an invalid field or expression."""
+
+
+def _ids_in(ids: list[int]) -> ColumnElement[bool]:
+    # rendered inline: a batch can exceed SQLite's bound-parameter limit
+    return JewelryItem.id.in_(
+        bindparam("batch_ids", ids, expanding=True, literal_execute=True)
+    )
+
+
+def _log(session: Session, item_ids: list[int]) -> None:
+    record_changes(
+        session.connection(),
+        (("item", i, i, "upsert") for i in dict.fromkeys(item_ids)),
+    )
+
+
+# ── per-item payloads ────────────────────────────────────────────────────
+def update_items(
+    session: Session, payloads: list[JewelryItemBatchUpdate]
+) -> tuple[list[BatchItemResult], dict[int, list[str]]]:
+    """
+    Apply each partial payload to its item. Returns the per-item results
+    and the new tag names of every re-tagged item (for the tag index).
+    """
+    ids = [p.id for p in payloads]
+    versions = dict(
+        session.exec(
+            select(JewelryItem.id, JewelryItem.version).where(_ids_in(ids))
+        ).all()
+    )
+    now = datetime.utcnow()
+    results: list[BatchItemResult] = []
+    rows: list[dict] = []
+    item_tags: dict[int, list[str]] = {}
+    for payload in payloads:
+        if payload.id not in versions:
+            results.append(BatchItemResult(id=payload.id, status="not_found"))
+            continue
+        data = payload.model_dump(exclude_unset=True, exclude={"id"})
+        tag_names = data.pop("tags", None)
+        if tag_names is not None:
+            item_tags[payload.id] = list(
+                dict.fromkeys(n.lower().strip() for n in tag_names if n.strip())
+            )
+        # the version is checked and bumped, like any ORM update
+        rows.append(
+            {
+                "id": payload.id,
+                **data,
+                "updated_at": now,
+                "version": versions[payload.id],
+            }
+        )
+        versions[payload.id] += 1  # the same id twice in one batch
+        results.append(BatchItemResult(id=payload.id, status="updated"))
+
+    if rows:
+        # ORM bulk UPDATE by primary key: one executemany per distinct key set
+        session.execute(update(JewelryItem), rows)
+    if item_tags:
+        _replace_tags(session, item_tags)
+    _log(session, [row["id"] for row in rows])
+    return results, item_tags
+
+
+def _replace_tags(session: Session, item_tags: dict[int, list[str]]) -> None:
+    names = {name for tags in item_tags.values() for name in tags}
+    tag_ids = dict(
+        session.exec(
+            select(JewelryTag.name, JewelryTag.id).where(JewelryTag.name.in_(names))
+        ).all()
+    )
+    missing = names - tag_ids.keys()
+    if missing:
+        session.execute(insert(JewelryTag), [{"name": n} for n in sorted(missing)])
+        new_ids = dict(
+            session.exec(
+                select(JewelryTag.name, JewelryTag.id).where(
+                    JewelryTag.name.in_(missing)
+                )
+            ).all()
+        )
+        record_changes(
+            session.connection(),
+            (("tag", tag_id, None, "upsert") for tag_id in new_ids.values()),
+        )
+        tag_ids.update(new_ids)
+    session.execute(
+        delete(ItemTagLink).where(
+            ItemTagLink.item_id.in_(
+                bindparam(
+                    "tagged_ids", list(item_tags), expanding=True, literal_execute=True
+                )
+            )
+        )
+    )
+    links = [
+        {"item_id": item_id, "tag_id": tag_ids[name]}
+        for item_id, tags in item_tags.items()
+        for name in tags
+    ]
+    if links:
+        session.execute(insert(ItemTagLink), links)
+
+
+# ── filter + expressions ─────────────────────────────────────────────────
+def _filter_clauses(index: TagIndex, flt: ItemFilter) -> list[ColumnElement[bool]]:
+    """Raises ``TagExpressionError`` for a malformed tag expression."""
+    clauses = []
+    if flt.ids is not None:
+        clauses.append(_ids_in(flt.ids))
+    for field in ("material", "gemstone", "category"):
+        value = getattr(flt, field)
+        if value is not None:
+            clauses.append(getattr(JewelryItem, field) == value)
+    if flt.tags:
+        clauses.append(tag_filter_clause(index, flt.tags))
+    if not clauses and not flt.all:
+        raise BatchUpdateError(
+            'The filter has no criteria; pass "all": true to update every item'
+        )
+    return clauses
+
+
+def _set_value(field: str, value: float | str | None) -> float | str | None:
+    """*value* checked (and coerced) against the column it is written to."""
+    if value is None:
+        if not JewelryItem.__table__.c[field].nullable:
+            raise BatchUpdateError(f"Field {field!r} cannot be null")
+        return None
+    if field not in NUMERIC_FIELDS:
+        if not isinstance(value, str):
+            raise BatchUpdateError(f"Field {field!r} takes text, got {value!r}")
+        return value
+    try:
+        number = float(value)
+    except ValueError:
+        raise BatchUpdateError(f"Field {field!r} takes a number, got {value!r}")
+    if not math.isfinite(number):
+        raise BatchUpdateError(f"Field {field!r} takes a finite number")
+    return number
+
+
+def _assignment(expr: ItemFieldExpression):
+    if expr.field not in UPDATABLE_FIELDS:
+        raise BatchUpdateError(f"Field {expr.field!r} cannot be batch-updated")
+    column = getattr(JewelryItem, expr.field)
+    if expr.op == "set":
+        return _set_value(expr.field, expr.value)
+    if expr.field not in NUMERIC_FIELDS or not isinstance(expr.value, int | float):
+        raise BatchUpdateError(
+            f"{expr.op!r} needs a numeric field and value, got {expr.field!r}"
+        )
+    value = column * expr.value if expr.op == "mul" else column + expr.value
+    return func.round(value, expr.round) if expr.round is not None else value
+
+
+def update_matching(
+    session: Session,
+    index: TagIndex,
+    flt: ItemFilter,
+    expressions: list[ItemFieldExpression],
+) -> list[int]:
+    """Apply *expressions* to every item matching *flt*; returns their ids."""
+    values = {expr.field: _assignment(expr) for expr in expressions}
+    values["updated_at"] = datetime.utcnow()
+    values["version"] = JewelryItem.version + 1
+    ids = (
+        session.execute(
+            update(JewelryItem)
+            .where(*_filter_clauses(index, flt))
+            .values(values)
+            .returning(JewelryItem.id)
+            .execution_options(synchronize_session=False)
+        )
+        .scalars()
+        .all()
+    )
+    _log(session, ids)
+    return sorted(ids)
@@ -0,0 +1,163 @@
+"""
+Bulk image import from a ZIP archive.
+
+Members are matched to items by file name – ``<item id or name>[_<n>].<ext>``,
+e.g. ``42.jpg``, ``42_3.png`` or ``Gold Ring_2.webp`` (case, spaces and
+underscores in names are interchangeable). Each matching member is copied
+straight from the archive into the job spool, one at a time, and queued for
+the image workers; nothing is extracted to memory. Rows are committed every
+``settings.bulk_upload_batch`` files.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import re
+import zipfile
+import zlib
+from collections.abc import Iterable
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from jewel_db.core.settings import settings
+from jewel_db.models.image_job import ImageJob
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.schemas.image_job import BulkUploadResult
+from jewel_db.services.image_jobs import enqueue_upload
+
+_SEQUENCE = re.compile(r"_\d+$")
+# what reading one bad member raises: CRC / truncation, corrupt deflate data,
+# an unsupported compression method, encryption
+_MEMBER_ERRORS = (
+    zipfile.BadZipFile,
+    zlib.error,
+    NotImplementedError,
+    RuntimeError,
+    OSError,
+)
+
+
+def _name_key(name: str) -> str:
+    return " ".join(re.split(r"[\s_]+", name.lower())).strip()
+
+
+def parse_member_name(filename: str) -> str:
+    """The item key encoded in *filename*: its stem minus any ``_<n>`` suffix."""
+    stem = PurePosixPath(filename).stem
+    return _SEQUENCE.sub("", stem) or stem
+
+
+class ItemMatcher:
+    """Resolves archive keys to item ids (by id first, then by name)."""
+
+    def __init__(self, rows: Iterable[tuple[int, str]]) -> None:
+        self.ids: set[int] = set()
+        self.names: dict[str, list[int]] = {}
+        for item_id, name in rows:
+            self.ids.add(item_id)
+            self.names.setdefault(_name_key(name), []).append(item_id)
+
+    def resolve(self, key: str) -> tuple[int | None, str | None]:
+        """*(item_id, None)* on a match, else *(None, reason)*."""
+        if key.isdigit() and int(key) in self.ids:
+            return int(key), None
+        matches = self.names.get(_name_key(key), [])
+        if len(matches) == 1:
+            return matches[0], None
+        if matches:
+            return None, f"ambiguous: {len(matches)} items named {key!r}"
+        return None, f"no item matches {key!r}"
+
+
+def _skip(info: zipfile.ZipInfo) -> bool:
+    """Directories and OS metadata (``__MACOSX/``, dot-files)."""
+    parts = PurePosixPath(info.filename).parts
+    return info.is_dir() or any(p.startswith((".", "__MACOSX")) for p in parts)
+
+
+def _check(
+    info: zipfile.ZipInfo,
+    result: BulkUploadResult,
+    matcher: ItemMatcher,
+    allowed_types: set[str],
+) -> tuple[str, int] | None:
+    """*(content type, item id)* for a member worth queuing; else fills *result*."""
+    content_type = mimetypes.guess_type(info.filename)[0]
+    if content_type not in allowed_types:
+        result.detail = "not a supported image type"
+        return None
+    if info.file_size > settings.bulk_upload_max_member:
+        result.status = "rejected"
+        result.detail = f"larger than {settings.bulk_upload_max_member} bytes"
+        return None
+    item_id, reason = matcher.resolve(parse_member_name(info.filename))
+    if item_id is None:
+        result.status, result.detail = "unmatched", reason
+        return None
+    return content_type, item_id
+
+
+def import_archive(
+    session: Session,
+    archive: BinaryIO,
+    *,
+    allowed_types: set[str],
+    media_dir: Path,
+) -> list[BulkUploadResult]:
+    """
+    Queue every matching image in the ZIP *archive* (a seekable file) and
+    return one result per member. Raises ``zipfile.BadZipFile``.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        matcher = ItemMatcher(session.exec(select(JewelryItem.id, JewelryItem.name)))
+        last_order = dict(
+            session.exec(
+                select(
+                    JewelryImage.item_id, func.max(JewelryImage.sort_order)
+                ).group_by(JewelryImage.item_id)
+            ).all()
+        )
+        results: list[BulkUploadResult] = []
+        batch: list[tuple[BulkUploadResult, ImageJob]] = []
+        for info in zf.infolist():
+            if _skip(info):
+                continue
+            result = BulkUploadResult(filename=info.filename, status="skipped")
+            results.append(result)
+            if (checked := _check(info, result, matcher, allowed_types)) is None:
+                continue
+            content_type, item_id = checked
+            try:
+                # the member is spooled in full before its rows are added,
+                # so a failure leaves nothing behind to roll back
+                with zf.open(info) as stream:
+                    _img, job = enqueue_upload(
+                        session,
+                        item_id=item_id,
+                        stream=stream,
+                        content_type=content_type,
+                        sort_order=last_order.get(item_id, 0) + 1,
+                        media_dir=media_dir,
+                    )
+            except _MEMBER_ERRORS as exc:
+                result.status, result.detail = "error", str(exc) or type(exc).__name__
+                continue
+            last_order[item_id] = last_order.get(item_id, 0) + 1
+            result.status, result.item_id = "queued", item_id
+            batch.append((result, job))
+            if len(batch) >= settings.bulk_upload_batch:
+                _commit(session, batch)
+        _commit(session, batch)
+    return results
+
+
+def _commit(session: Session, batch: list[tuple[BulkUploadResult, ImageJob]]) -> None:
+    session.flush()  # assign job ids before commit expires the objects
+    for result, job in batch:
+        result.job_id = job.id
+    session.commit()
+    batch.clear()
@@ -0,0 +1,164 @@
+"""
+In-memory perceptual-hash index.
+
+Image fingerprints live in a contiguous ``uint64`` NumPy array so a
+similarity query is one vectorised XOR + popcount over every image –
+a few milliseconds for half a million hashes. Writes append or
+swap-remove in place; a periodic reload (``settings.image_index_ttl``)
+picks up writes made by other workers. The index is loaded at startup and
+reloaded in a background thread, never while a request waits.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import numpy as np
+from sqlmodel import Session, select
+
+from jewel_db.core.settings import settings
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.schemas.jewelry_image import SimilarImage
+
+log = logging.getLogger(__name__)
+
+
+def _hex_to_u64(hashes: list[str]) -> np.ndarray:
+    return np.frombuffer(bytes.fromhex("".join(hashes)), dtype=">u8").astype(np.uint64)
+
+
+class ImageHashIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._image_ids = np.empty(0, dtype=np.int64)
+        self._item_ids = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._pos: dict[int, int] = {}  # image id → array slot
+        self._reloading = False
+        self.loaded_at: float | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, image_id: int) -> bool:
+        return image_id in self._pos
+
+    # ── (re)loading ──────────────────────────────────────────────────────
+    def load(self, session: Session) -> None:
+        """Rebuild from every hashed ``JewelryImage`` row."""
+        rows = session.exec(
+            select(JewelryImage.id, JewelryImage.item_id, JewelryImage.phash).where(
+                JewelryImage.phash.is_not(None)
+            )
+        ).all()
+        image_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        item_ids = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+        hashes = _hex_to_u64([r[2] for r in rows])
+        with self._lock:
+            self._image_ids, self._item_ids, self._hashes = image_ids, item_ids, hashes
+            self._size = len(rows)
+            self._pos = {int(i): n for n, i in enumerate(image_ids)}
+            self.loaded_at = time.monotonic()
+
+    def ensure_fresh(self, session: Session) -> None:
+        """
+        Load on first use; once the TTL has expired, start a reload in the
+        background and keep serving the current arrays meanwhile.
+        """
+        if self.loaded_at is None:
+            self.load(session)
+        elif time.monotonic() - self.loaded_at > settings.image_index_ttl:
+            self._reload_in_background(session.get_bind())
+
+    def _reload_in_background(self, bind) -> None:
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+
+        def reload() -> None:
+            try:
+                with Session(bind) as session:
+                    self.load(session)
+            except Exception:
+                log.exception("image index reload failed")
+            finally:
+                self._reloading = False
+
+        threading.Thread(target=reload, name="image-index-reload", daemon=True).start()
+
+    # ── writes ───────────────────────────────────────────────────────────
+    def add(self, image_id: int, item_id: int, phash: str) -> None:
+        with self._lock:
+            if image_id in self._pos:
+                self.remove(image_id)
+            if self._size == len(self._hashes):  # grow ×2
+                capacity = max(1024, 2 * self._size)
+                self._hashes = np.resize(self._hashes, capacity)
+                self._image_ids = np.resize(self._image_ids, capacity)
+                self._item_ids = np.resize(self._item_ids, capacity)
+            n = self._size
+            self._hashes[n] = int(phash, 16)
+            self._image_ids[n] = image_id
+            self._item_ids[n] = item_id
+            self._pos[image_id] = n
+            self._size += 1
+
+    def remove(self, image_id: int) -> None:
+        with self._lock:
+            n = self._pos.pop(image_id, None)
+            if n is None:
+                return
+            last = self._size - 1
+            if n != last:  # move the last entry into the hole
+                for arr in (self._hashes, self._image_ids, self._item_ids):
+                    arr[n] = arr[last]
+                self._pos[int(self._image_ids[n])] = n
+            self._size = last
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def search(
+        self,
+        phash: str,
+        max_distance: int = 10,
+        limit: int = 20,
+        exclude_image: int | None = None,
+    ) -> list[tuple[int, int, int]]:
+        """
+        Images within *max_distance* bits of *phash*, closest first, as
+        *(image_id, item_id, distance)*.
+        """
+        with self._lock:
+            n = self._size
+            distances = np.bitwise_count(self._hashes[:n] ^ np.uint64(int(phash, 16)))
+            hits = np.flatnonzero(distances <= max_distance)
+            if exclude_image is not None:
+                hits = hits[self._image_ids[hits] != exclude_image]
+            if len(hits) > limit:
+                nearest = np.argpartition(distances[hits], limit - 1)[:limit]
+                hits = hits[nearest]
+            hits = hits[np.argsort(distances[hits], kind="stable")]
+            return [
+                (int(self._image_ids[i]), int(self._item_ids[i]), int(distances[i]))
+                for i in hits
+            ]
+
+
+image_index = ImageHashIndex()
+
+
+def similar_images(
+    index: ImageHashIndex, img: JewelryImage, max_distance: int, limit: int
+) -> list[SimilarImage]:
+    """Images resembling *img* (itself excluded) as API objects."""
+    if not img.phash:
+        return []
+    return [
+        SimilarImage(image_id=image_id, item_id=item_id, distance=distance)
+        for image_id, item_id, distance in index.search(
+            img.phash, max_distance, limit, exclude_image=img.id
+        )
+    ]
@@ -0,0 +1,294 @@
+"""
+Persistent image-processing queue.
+
+Uploads are spooled to ``media/incoming`` and an ``ImageJob`` row is
+written in the same transaction as the pending ``JewelryImage``. Worker
+processes (``python -m jewel_db.worker``) claim jobs with a single atomic
+``UPDATE … RETURNING``, so any number of them can share one database and
+media directory. Failures are retried with exponential backoff; a job
+whose worker died is reclaimed once its lease expires.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from jewel_db.core.change_feed import record_changes
+from jewel_db.core.settings import settings
+from jewel_db.models.image_job import ImageJob
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.services.image_utils import dhash, normalise_image, output_extension
+
+log = logging.getLogger(__name__)
+
+
+def enqueue_upload(
+    session: Session,
+    *,
+    item_id: int,
+    stream: BinaryIO,
+    content_type: str,
+    sort_order: int,
+    media_dir: Path,
+) -> tuple[JewelryImage, ImageJob]:
+    """
+    Spool *stream* to disk and add a pending image plus its job to
+    *session* (the caller commits).
+    """
+    incoming = media_dir / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    source = incoming / uuid.uuid4().hex
+    try:
+        with source.open("wb") as fh:
+            shutil.copyfileobj(stream, fh)
+    except BaseException:
+        source.unlink(missing_ok=True)
+        raise
+    return _add_job(session, item_id, source, content_type, sort_order, media_dir)
+
+
+def enqueue_file(
+    session: Session,
+    *,
+    item_id: int,
+    path: Path,
+    content_type: str,
+    sort_order: int,
+    media_dir: Path,
+) -> tuple[JewelryImage, ImageJob]:
+    """Like ``enqueue_upload``, but moves an already-spooled file into place."""
+    incoming = media_dir / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    source = incoming / uuid.uuid4().hex
+    os.replace(path, source)
+    return _add_job(session, item_id, source, content_type, sort_order, media_dir)
+
+
+def _add_job(
+    session: Session,
+    item_id: int,
+    source: Path,
+    content_type: str,
+    sort_order: int,
+    media_dir: Path,
+) -> tuple[JewelryImage, ImageJob]:
+    fname = f"{source.name}{output_extension(content_type)}"
+    img = JewelryImage(
+        url=f"/media/{fname}",
+        sort_order=sort_order,
+        item_id=item_id,
+        status="pending",
+    )
+    session.add(img)
+    session.flush()  # assigns img.id
+    job = ImageJob(
+        image_id=img.id,
+        source_path=str(source),
+        target_path=str(media_dir / fname),
+        content_type=content_type,
+    )
+    session.add(job)
+    return img, job
+
+
+# ── worker side ──────────────────────────────────────────────────────────
+def claim_job(session: Session, worker_id: str) -> ImageJob | None:
+    """Atomically take the oldest runnable job (or a stale running one)."""
+    now = datetime.utcnow()
+    runnable = (
+        select(ImageJob.id)
+        .where(
+            or_(
+                and_(ImageJob.status == "queued", ImageJob.available_at <= now),
+                and_(
+                    ImageJob.status == "running",
+                    ImageJob.locked_at
+                    < now - timedelta(seconds=settings.image_job_lease_s),
+                ),
+            )
+        )
+        .order_by(ImageJob.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    job_id = session.execute(
+        update(ImageJob)
+        .where(ImageJob.id == runnable)
+        .values(
+            status="running",
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=ImageJob.attempts + 1,
+        )
+        .returning(ImageJob.id)
+    ).scalar()
+    session.commit()
+    return session.get(ImageJob, job_id) if job_id is not None else None
+
+
+def process_job(session: Session, job: ImageJob, worker_id: str) -> None:
+    """
+    Normalise, fingerprint and publish one upload claimed by *worker_id*;
+    records the outcome. Nothing is recorded, or published, if the lease
+    expired and another worker took the job over.
+    """
+    img = session.get(JewelryImage, job.image_id)
+    if img is None:  # deleted while queued
+        _finish(session, job, worker_id, "cancelled", "image deleted")
+        return
+    image_id, item_id = img.id, img.item_id
+    target = Path(job.target_path)
+    # private to this attempt: a worker that lost its lease never touches
+    # the output of the one that took over
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+    try:
+        try:
+            phash = _render(job, tmp)
+        except Exception as exc:
+            session.rollback()
+            _retry_or_fail(session, job, worker_id, exc)
+            return
+        if not _set_image(session, image_id, item_id, status="ready", phash=phash):
+            target.unlink(missing_ok=True)  # deleted while we worked
+            _finish(session, job, worker_id, "cancelled", "image deleted")
+            return
+        # published only once the lease is confirmed, never half-written
+        _finish(session, job, worker_id, "done", publish=lambda: tmp.replace(target))
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _render(job: ImageJob, tmp: Path) -> str:
+    """Write the normalised upload to *tmp*; returns its perceptual hash."""
+    raw = Path(job.source_path).read_bytes()
+    if job.content_type == "image/gif":
+        data = raw
+    else:
+        data, _ext = normalise_image(raw, job.content_type)
+    tmp.write_bytes(data)
+    return dhash(data)
+
+
+def _set_image(session: Session, image_id: int, item_id: int, **values) -> bool:
+    """Update the image unless it is gone; bulk, so log the change ourselves."""
+    updated = session.execute(
+        update(JewelryImage).where(JewelryImage.id == image_id).values(**values)
+    ).rowcount
+    if updated:
+        record_changes(session.connection(), [("image", image_id, item_id, "upsert")])
+    return bool(updated)
+
+
+def _release(
+    session: Session,
+    job: ImageJob,
+    owner: str,
+    publish: Callable[[], object] | None = None,
+    **values,
+) -> bool:
+    """
+    Update and unlock *job* and commit – only while *owner* still holds it,
+    otherwise roll back everything done since the last commit. *publish*
+    runs between the two, while the job row is write-locked.
+    """
+    released = session.execute(
+        update(ImageJob)
+        .where(ImageJob.id == job.id, ImageJob.locked_by == owner)
+        .values(locked_by=None, locked_at=None, **values)
+    ).rowcount
+    if not released:
+        log.warning("image job %s: lease lost to another worker", job.id)
+        session.rollback()
+        return False
+    if publish is not None:
+        try:
+            publish()
+        except BaseException:
+            session.rollback()
+            raise
+    session.commit()
+    return True
+
+
+def _finish(
+    session: Session,
+    job: ImageJob,
+    owner: str,
+    status: str,
+    error: str | None = None,
+    publish: Callable[[], object] | None = None,
+) -> None:
+    source = Path(job.source_path)
+    if _release(
+        session,
+        job,
+        owner,
+        publish,
+        status=status,
+        error=error,
+        finished_at=datetime.utcnow(),
+    ):
+        source.unlink(missing_ok=True)
+
+
+def _retry_or_fail(session: Session, job: ImageJob, owner: str, exc: Exception) -> None:
+    error = f"{type(exc).__name__}: {exc}"
+    if job.attempts >= settings.image_job_max_attempts:
+        log.error("image job %s failed permanently: %s", job.id, error)
+        img = session.get(JewelryImage, job.image_id)
+        if img is not None:
+            _set_image(session, img.id, img.item_id, status="failed")
+        _finish(session, job, owner, "failed", error)
+        return
+    delay = settings.image_job_retry_s * 2 ** (job.attempts - 1)
+    log.warning("image job %s failed (retry in %.0fs): %s", job.id, delay, error)
+    _release(
+        session,
+        job,
+        owner,
+        status="queued",
+        error=error,
+        available_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+
+
+def run_worker(
+    engine: Engine,
+    worker_id: str | None = None,
+    stop: threading.Event | None = None,
+    sweep: Callable[[Session], object] | None = None,
+) -> None:
+    """
+    Claim and process jobs until *stop* is set. *sweep* (housekeeping such
+    as dropping stale upload sessions) runs every ``settings.upload_sweep_s``.
+    """
+    worker_id = worker_id or f"{os.uname().nodename}:{os.getpid()}"
+    stop = stop or threading.Event()
+    log.info("image worker %s started", worker_id)
+    next_sweep = time.monotonic()
+    while not stop.is_set():
+        try:
+            with Session(engine) as session:  # rolls back whatever was left open
+                if sweep is not None and time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + settings.upload_sweep_s
+                    sweep(session)
+                job = claim_job(session, worker_id)
+                if job is not None:
+                    process_job(session, job, worker_id)
+                    continue
+        except Exception:  # e.g. "database is locked": log and keep polling
+            log.exception("image worker %s: iteration failed", worker_id)
+        stop.wait(settings.image_job_poll_s)
@@ -1,5 +1,5 @@
 """
-Lightweight helpers for normalising uploaded images.
+Lightweight helpers for normalising and fingerprinting uploaded images.
 
 Keeps everything in-memory, uses Pillow only.
 """
@@ -13,9 +13,15 @@ from PIL import Image
 
 MAX_DIM = 1600  # px – longest side
 JPEG_QUALITY = 85  # %
+HASH_SIZE = 8  # dHash grid → 8 × 8 = 64-bit fingerprint
 AllowedType = Literal["image/jpeg", "image/png", "image/webp"]
 
 
+def output_extension(mime: str) -> str:
+    """File extension ``normalise_image`` (or the GIF passthrough) produces."""
+    return {"image/png": ".png", "image/gif": ".gif"}.get(mime, ".jpg")
+
+
 def normalise_image(data: bytes, mime: AllowedType) -> tuple[bytes, str]:
     """
     Down-scale / recompress *data* so the longest side ≤ MAX_DIM
@@ -46,3 +52,23 @@ def normalise_image(data: bytes, mime: AllowedType) -> tuple[bytes, str]:
             ext = ".jpg"
 
     return buf.getvalue(), ext
+
+
+def dhash(data: bytes) -> str:
+    """
+    64-bit difference hash of *data* as 16 hex digits.
+
+    The image is reduced to a 9 × 8 greyscale grid and each bit records
+    whether a pixel is brighter than its right-hand neighbour, so re-crops,
+    re-encodes and small colour shifts land within a few bits of each other.
+    """
+    img = Image.open(BytesIO(data))
+    img.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))  # fast JPEG downscale
+    img = img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    px = img.tobytes()
+    bits = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            bits = bits << 1 | (px[offset + col] > px[offset + col + 1])
+    return f"{bits:016x}"
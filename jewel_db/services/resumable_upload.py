@@ -0,0 +1,249 @@
+"""
+Resumable chunked uploads.
+
+A client opens a session for one image (``POST /api/uploads``), then sends
+its bytes as numbered chunks, each tagged with the offset it starts at
+(``PUT /api/uploads/{id}/chunks/{n}`` + ``Upload-Offset``). A chunk is
+streamed into a part file of its own and may carry a SHA-256 that is
+checked before it counts; only then is it appended to the session's spool
+file under ``media/uploads``, holding an exclusive lock on that file while
+the offset is re-checked and advanced, so concurrent PUTs of the same
+chunk can never overwrite (or truncate) each other's bytes. After a
+dropped connection the client asks for the current offset (``HEAD``) and
+carries on from there. Completing the session checks the size and
+whole-file digest and moves the file into the image job queue.
+
+Sessions untouched for ``settings.upload_session_ttl`` are swept, spool
+and part files included, by the image workers and whenever a new session
+is opened.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import shutil
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, update
+from sqlmodel import Session, select
+
+from jewel_db.core.settings import settings
+from jewel_db.models.image_job import ImageJob
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.models.upload_session import UploadSession
+from jewel_db.services.image_jobs import enqueue_file
+
+_WRITE_BUFFER = 1024 * 1024  # bytes gathered per thread-pool write
+
+
+class UploadError(ValueError):
+    """Raised for a chunk or completion the session cannot accept."""
+
+    status_code = 400
+
+
+class UploadConflict(UploadError):
+    """The chunk does not start where the session left off."""
+
+    status_code = 409
+
+
+class UploadTooLarge(UploadError):
+    status_code = 413
+
+
+def create_session(
+    session: Session,
+    *,
+    item_id: int,
+    filename: str,
+    content_type: str,
+    size: int,
+    sha256: str | None,
+    media_dir: Path,
+) -> UploadSession:
+    """Open a session with an empty spool file (the caller commits)."""
+    if size > settings.upload_max_size:
+        raise UploadTooLarge(f"Uploads are limited to {settings.upload_max_size} bytes")
+    spool = media_dir / "uploads"
+    spool.mkdir(parents=True, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    path = spool / upload_id
+    path.touch()
+    upload = UploadSession(
+        id=upload_id,
+        item_id=item_id,
+        filename=filename,
+        content_type=content_type,
+        size=size,
+        sha256=sha256,
+        path=str(path),
+    )
+    session.add(upload)
+    return upload
+
+
+def check_next(upload: UploadSession, *, index: int, offset: int) -> None:
+    """Raises ``UploadConflict`` unless chunk *index* at *offset* comes next."""
+    if upload.status != "open":
+        raise UploadConflict("Upload is already complete")
+    if offset != upload.offset or index != upload.chunks:
+        raise UploadConflict(
+            f"Expected chunk {upload.chunks} at offset {upload.offset}, "
+            f"got chunk {index} at offset {offset}"
+        )
+
+
+async def receive_chunk(
+    upload: UploadSession,
+    *,
+    offset: int,
+    body: AsyncIterator[bytes],
+    sha256: str | None = None,
+) -> Path:
+    """
+    Stream the request *body* into a new part file (disk writes run in the
+    thread pool) and verify its size and checksum; returns the part file.
+    """
+    limit = min(settings.upload_chunk_max, upload.size - offset)
+    part = Path(f"{upload.path}.{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    received = 0
+    buffer = bytearray()
+    fh = await run_in_threadpool(part.open, "wb")
+    try:
+        async for data in body:
+            received += len(data)
+            if received > limit:
+                raise UploadTooLarge(
+                    f"Chunk exceeds {limit} bytes (chunk limit or declared size)"
+                )
+            digest.update(data)
+            buffer += data
+            if len(buffer) >= _WRITE_BUFFER:
+                await run_in_threadpool(fh.write, bytes(buffer))
+                buffer.clear()
+        await run_in_threadpool(fh.write, bytes(buffer))
+        if not received:
+            raise UploadError("Empty chunk")
+        if sha256 and digest.hexdigest() != sha256.lower():
+            raise UploadError("Checksum mismatch for chunk")
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    finally:
+        await run_in_threadpool(fh.close)
+    return part
+
+
+def append_chunk(
+    session: Session, upload: UploadSession, part: Path, *, index: int, offset: int
+) -> None:
+    """
+    Append the verified *part* as chunk *index* and advance the session;
+    the part file is removed either way. Blocking – run it in a thread.
+    """
+    try:
+        with open(upload.path, "r+b") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)  # released when the file is closed
+            session.refresh(upload)  # another PUT may have won meanwhile
+            check_next(upload, index=index, offset=offset)
+            try:
+                fh.seek(offset)
+                with part.open("rb") as src:
+                    shutil.copyfileobj(src, fh)
+                fh.flush()
+                session.execute(
+                    update(UploadSession)
+                    .where(UploadSession.id == upload.id)
+                    .values(
+                        offset=fh.tell(),
+                        chunks=index + 1,
+                        updated_at=datetime.utcnow(),
+                    )
+                )
+                session.commit()
+            except BaseException:
+                session.rollback()
+                fh.truncate(offset)  # under the lock, nothing past it counts
+                raise
+    finally:
+        part.unlink(missing_ok=True)
+        session.refresh(upload)  # loaded for the response, even after an error
+
+
+def complete(session: Session, upload: UploadSession, media_dir: Path) -> ImageJob:
+    """
+    Queue the finished upload for normalisation (idempotent: a repeated
+    call returns the same job). A digest mismatch discards the session.
+    """
+    if upload.status == "complete":
+        return session.get(ImageJob, upload.job_id)
+    if upload.offset != upload.size:
+        raise UploadConflict(f"Received {upload.offset} of {upload.size} bytes")
+    if upload.sha256 and _file_sha256(Path(upload.path)) != upload.sha256:
+        discard(session, upload)
+        raise UploadError("Checksum mismatch; start a new upload")
+
+    last_order = session.exec(
+        select(func.max(JewelryImage.sort_order)).where(
+            JewelryImage.item_id == upload.item_id
+        )
+    ).one()
+    _img, job = enqueue_file(
+        session,
+        item_id=upload.item_id,
+        path=Path(upload.path),
+        content_type=upload.content_type,
+        sort_order=(last_order or 0) + 1,
+        media_dir=media_dir,
+    )
+    try:
+        session.flush()
+        upload.status, upload.job_id = "complete", job.id
+        upload.updated_at = datetime.utcnow()
+        session.add(upload)
+        session.commit()
+    except BaseException:
+        session.rollback()
+        os.replace(job.source_path, upload.path)  # the session stays resumable
+        raise
+    return job
+
+
+def discard(session: Session, upload: UploadSession) -> None:
+    Path(upload.path).unlink(missing_ok=True)
+    session.delete(upload)
+    session.commit()
+
+
+def sweep_stale(session: Session) -> int:
+    """Drop sessions idle for longer than the TTL; returns how many."""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.upload_session_ttl)
+    # one DELETE … RETURNING, so concurrent sweepers never trip over each other
+    stale = session.execute(
+        delete(UploadSession)
+        .where(UploadSession.updated_at < cutoff)
+        .returning(UploadSession.path)
+    ).all()
+    session.commit()
+    for (path,) in stale:
+        spool = Path(path)
+        spool.unlink(missing_ok=True)  # already moved if complete
+        for part in spool.parent.glob(f"{spool.name}.*.part"):
+            part.unlink(missing_ok=True)
+    return len(stale)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        while data := fh.read(1024 * 1024):
+            digest.update(data)
+    return digest.hexdigest()
@@ -0,0 +1,296 @@
+"""
+In-memory tag index.
+
+Keeps tag names in a sorted list (prefix lookups are two bisects), the tag
+set of every item, per-tag usage counts and a tag → item-id bitmap (a
+Python ``int`` with bit *n* set for item *n*). Tag expressions such as
+``gold AND vintage AND NOT ring`` are evaluated as bitwise set operations
+instead of SQL joins over ``itemtaglink``.
+
+The API write paths update it after each commit; a periodic reload
+(``settings.tag_index_ttl``) picks up writes made by other workers.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import ColumnElement, bindparam
+from sqlmodel import Session, select
+
+from jewel_db.core.settings import settings
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.models.jewelry_tag import ItemTagLink, JewelryTag
+
+# bit offsets set in each byte value, for fast bitmap → id expansion
+_BYTE_BITS = [tuple(b for b in range(8) if v >> b & 1) for v in range(256)]
+
+
+class TagExpressionError(ValueError):
+    """Raised for a malformed tag expression."""
+
+
+def bitmap_ids(bitmap: int) -> list[int]:
+    """Item ids whose bit is set in *bitmap*, ascending."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    return [
+        pos * 8 + bit
+        for pos, byte in enumerate(data)
+        if byte
+        for bit in _BYTE_BITS[byte]
+    ]
+
+
+# ── expression parsing ───────────────────────────────────────────────────
+#   expr   := term (OR term)*
+#   term   := factor ([AND] factor)*      (juxtaposition means AND)
+#   factor := NOT factor | "(" expr ")" | tag | "quoted tag"
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_KEYWORDS = {"and", "or", "not"}
+# parsing and evaluation recurse per operator: bound both so a hostile
+# expression is a TagExpressionError, never a RecursionError
+_MAX_TOKENS = 256
+_MAX_DEPTH = 32  # nested NOTs / parentheses
+
+Node = tuple  # ("tag", name) | ("not", n) | ("and", a, b) | ("or", a, b)
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    pos, text = 0, expression.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise TagExpressionError(f"Unexpected input at {pos}: {text[pos:]!r}")
+        pos = m.end()
+        lpar, rpar, quoted, word = m.groups()
+        if lpar:
+            tokens.append(("(", lpar))
+        elif rpar:
+            tokens.append((")", rpar))
+        elif quoted is not None:
+            tokens.append(("tag", quoted.lower().strip()))
+        elif word.lower() in _KEYWORDS:
+            tokens.append((word.lower(), word))
+        else:
+            tokens.append(("tag", word.lower()))
+        if len(tokens) > _MAX_TOKENS:
+            raise TagExpressionError(f"Tag expression longer than {_MAX_TOKENS} terms")
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser over the token list."""
+
+    def __init__(self, tokens: list[tuple[str, str]]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self, kind: str) -> str:
+        if self.peek() != kind:
+            found = (
+                self.tokens[self.pos][1]
+                if self.pos < len(self.tokens)
+                else "end of expression"
+            )
+            raise TagExpressionError(f"Expected {kind!r}, found {found!r}")
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def expr(self) -> Node:
+        node = self.term()
+        while self.peek() == "or":
+            self.take("or")
+            node = ("or", node, self.term())
+        return node
+
+    def term(self) -> Node:
+        node = self.factor()
+        while self.peek() in ("and", "not", "(", "tag"):
+            if self.peek() == "and":
+                self.take("and")
+            node = ("and", node, self.factor())
+        return node
+
+    def factor(self) -> Node:
+        if self.peek() not in ("not", "("):
+            return ("tag", self.take("tag"))
+        self.depth += 1
+        if self.depth > _MAX_DEPTH:
+            raise TagExpressionError(f"Tag expression nested deeper than {_MAX_DEPTH}")
+        if self.peek() == "not":
+            self.take("not")
+            node = ("not", self.factor())
+        else:
+            self.take("(")
+            node = self.expr()
+            self.take(")")
+        self.depth -= 1
+        return node
+
+
+def parse_tag_expression(expression: str) -> Node:
+    """Parse *expression* into a small AST; raises ``TagExpressionError``."""
+    parser = _Parser(_tokenize(expression))
+    if not parser.tokens:
+        raise TagExpressionError("Empty tag expression")
+    node = parser.expr()
+    if parser.peek() is not None:
+        raise TagExpressionError(f"Unexpected {parser.tokens[parser.pos][1]!r}")
+    return node
+
+
+# ── index ────────────────────────────────────────────────────────────────
+class TagIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._names: list[str] = []  # sorted
+        self._counts: dict[str, int] = {}
+        self._bitmaps: dict[str, int] = {}
+        self._items = 0  # bitmap of every item id (the universe for NOT)
+        self._item_tags: dict[int, frozenset[str]] = {}
+        self.loaded_at: float | None = None
+
+    # ── (re)loading ──────────────────────────────────────────────────────
+    def load(self, session: Session) -> None:
+        """Rebuild from the database."""
+        names = session.exec(select(JewelryTag.name)).all()
+        item_ids = session.exec(select(JewelryItem.id)).all()
+        links = session.exec(
+            select(ItemTagLink.item_id, JewelryTag.name).join(
+                JewelryTag, JewelryTag.id == ItemTagLink.tag_id
+            )
+        ).all()
+        item_tags: dict[int, set[str]] = {}
+        bitmaps = dict.fromkeys(names, 0)
+        for item_id, name in links:
+            item_tags.setdefault(item_id, set()).add(name)
+            bitmaps[name] |= 1 << item_id
+        items = 0
+        for item_id in item_ids:
+            items |= 1 << item_id
+
+        with self._lock:
+            self._names = sorted(names)
+            self._bitmaps = bitmaps
+            self._counts = {name: bm.bit_count() for name, bm in bitmaps.items()}
+            self._items = items
+            self._item_tags = {i: frozenset(t) for i, t in item_tags.items()}
+            self.loaded_at = time.monotonic()
+
+    def ensure_fresh(self, session: Session) -> None:
+        """Load on first use and again once the TTL has expired."""
+        if (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > settings.tag_index_ttl
+        ):
+            self.load(session)
+
+    # ── tag writes ───────────────────────────────────────────────────────
+    def add_tag(self, name: str) -> None:
+        with self._lock:
+            if name not in self._counts:
+                self._counts[name] = 0
+                self._bitmaps[name] = 0
+                insort(self._names, name)
+
+    def remove_tag(self, name: str) -> None:
+        with self._lock:
+            if self._counts.pop(name, None) is None:
+                return
+            del self._names[bisect_left(self._names, name)]
+            for item_id in bitmap_ids(self._bitmaps.pop(name)):
+                self._item_tags[item_id] = self._item_tags[item_id] - {name}
+
+    def rename_tag(self, old: str, new: str) -> None:
+        if old == new:
+            return
+        with self._lock:
+            bitmap = self._bitmaps.get(old, 0)
+            self.remove_tag(old)
+            self.add_tag(new)
+            self._bitmaps[new] |= bitmap
+            self._counts[new] = self._bitmaps[new].bit_count()
+            for item_id in bitmap_ids(bitmap):
+                self._item_tags[item_id] = self._item_tags[item_id] | {new}
+
+    # ── item writes ──────────────────────────────────────────────────────
+    def set_item_tags(self, item_id: int, names: Iterable[str]) -> None:
+        new = frozenset(names)
+        bit = 1 << item_id
+        with self._lock:
+            old = self._item_tags.get(item_id, frozenset())
+            for name in old - new:
+                self._counts[name] -= 1
+                self._bitmaps[name] &= ~bit
+            for name in new - old:
+                self.add_tag(name)
+                self._counts[name] += 1
+                self._bitmaps[name] |= bit
+            self._items |= bit
+            self._item_tags[item_id] = new
+
+    def drop_item(self, item_id: int) -> None:
+        with self._lock:
+            self.set_item_tags(item_id, ())
+            self._items &= ~(1 << item_id)
+            self._item_tags.pop(item_id, None)
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def count(self, name: str) -> int:
+        return self._counts.get(name, 0)
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[tuple[str, int]]:
+        """Top *limit* tags starting with *prefix*, most used first."""
+        prefix = prefix.lower().strip()
+        with self._lock:
+            lo = bisect_left(self._names, prefix)
+            hi = bisect_left(self._names, prefix + "\U0010ffff", lo)
+            best = heapq.nsmallest(
+                limit, self._names[lo:hi], key=lambda n: (-self._counts[n], n)
+            )
+            return [(name, self._counts[name]) for name in best]
+
+    def match(self, expression: str) -> list[int]:
+        """Ids of the items matching the tag *expression*, ascending."""
+        evaluate = self._compile(parse_tag_expression(expression))
+        with self._lock:
+            return bitmap_ids(evaluate())
+
+    def _compile(self, node: Node) -> Callable[[], int]:
+        match node:
+            case ("tag", name):
+                return lambda: self._bitmaps.get(name, 0)
+            case ("not", inner):
+                f = self._compile(inner)
+                return lambda: self._items & ~f()
+            case ("and", left, right):
+                fl, fr = self._compile(left), self._compile(right)
+                return lambda: fl() & fr()
+            case ("or", left, right):
+                fl, fr = self._compile(left), self._compile(right)
+                return lambda: fl() | fr()
+        raise TagExpressionError(f"Unknown node {node!r}")  # pragma: no cover
+
+
+tag_index = TagIndex()
+
+
+def tag_filter_clause(index: TagIndex, expression: str) -> ColumnElement[bool]:
+    """
+    ``JewelryItem.id IN (…)`` for the items matching *expression*. Ids are
+    rendered inline, so large matches don't hit the bound-parameter limit.
+    """
+    ids = index.match(expression)
+    return JewelryItem.id.in_(
+        bindparam("tag_ids", ids, expanding=True, literal_execute=True)
+    )
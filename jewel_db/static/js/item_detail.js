@@ -171,12 +171,15 @@ document.addEventListener("DOMContentLoaded", () => {
   let images = [];
   async function refreshGallery() {
     const data = await fetch(`/api/items/${itemId}/images`).then(r => r.json());
-    images = data.map(i => i.url);
+    images = data.filter(i => i.status === "ready").map(i => i.url);
     gallery.innerHTML = data.map(i => `
       <li data-id="${i.id}" class="relative cursor-pointer border rounded overflow-hidden">
         <button data-image-id="${i.id}"
                 class="image-delete-btn absolute top-2 right-2 bg-red-600 hover:bg-red-700 text-white px-1 py-0.5 rounded text-xs">×</button>
-        <img src="${i.url}" class="w-full h-48 object-cover" loading="lazy"/>
+        ${i.status === "ready"
+          ? `<img src="${i.url}" class="w-full h-48 object-cover" loading="lazy"/>`
+          : `<div class="w-full h-48 flex items-center justify-center bg-gray-100 text-gray-500 text-sm">
+               ${i.status === "pending" ? "Processing…" : "Processing failed"}</div>`}
         ${i.sort_order===1?`<span class="absolute top-2 left-2 bg-yellow-400 text-white px-1 rounded text-sm">★ Thumbnail</span>`:""}
       </li>
     `).join("");
@@ -205,8 +208,8 @@ document.addEventListener("DOMContentLoaded", () => {
       return;
     }
     const li = e.target.closest("li");
-    if (li) {
-      let idx = images.indexOf(li.querySelector("img").src);
+    if (li && li.querySelector("img")) {
+      let idx = images.indexOf(new URL(li.querySelector("img").src).pathname);
       if (idx < 0) idx = 0;
       lightbox.dataset.idx = idx;
       lbImg.src = images[idx];
@@ -215,18 +218,88 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   });
 
+  // uploads are processed in the background – poll until every job settles
+  async function pollJobs(jobs) {
+    let pending = jobs.filter(j => j.status === "queued" || j.status === "running");
+    while (pending.length) {
+      await new Promise(r => setTimeout(r, 1000));
+      const qs = pending.map(j => `ids=${j.id}`).join("&");
+      jobs = await fetch(`/api/jobs/?${qs}`).then(r => r.json());
+      pending = jobs.filter(j => j.status === "queued" || j.status === "running");
+      refreshGallery();
+    }
+    const dupes = jobs.flatMap(j => j.duplicates);
+    if (dupes.length) {
+      const items = [...new Set(dupes.map(d => d.item_id))].join(", ");
+      alert(`Possible duplicate of images on item(s) ${items}`);
+    }
+  }
+
+  // large files go up in chunks and resume after a dropped connection
+  const CHUNK = 4 * 1024 * 1024;
+  async function sha256(blob) {
+    const digest = await crypto.subtle.digest("SHA-256", await blob.arrayBuffer());
+    return [...new Uint8Array(digest)].map(b => b.toString(16).padStart(2, "0")).join("");
+  }
+  async function uploadResumable(file) {
+    const upload = await fetch("/api/uploads/", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        item_id: itemId, filename: file.name, content_type: file.type, size: file.size,
+      }),
+    }).then(r => (r.ok ? r.json() : null));
+    if (!upload) return null;
+    let offset = 0, index = 0, failures = 0;
+    while (offset < file.size) {
+      const chunk = file.slice(offset, offset + CHUNK);
+      try {
+        const res = await fetch(`/api/uploads/${upload.id}/chunks/${index}`, {
+          method: "PUT",
+          headers: { "Upload-Offset": offset, "X-Chunk-Sha256": await sha256(chunk) },
+          body: chunk,
+        });
+        if (res.ok) { offset += chunk.size; index += 1; failures = 0; continue; }
+        if (res.status !== 409 && res.status !== 400) return null;
+      } catch { /* network error: ask the server where to resume */ }
+      if (++failures > 5) return null;
+      await new Promise(r => setTimeout(r, 1000 * 2 ** failures));
+      const head = await fetch(`/api/uploads/${upload.id}`, { method: "HEAD" }).catch(() => null);
+      if (head?.ok) {
+        offset = +head.headers.get("Upload-Offset");
+        index = +head.headers.get("Upload-Chunk");
+      }
+    }
+    const res = await fetch(`/api/uploads/${upload.id}/complete`, { method: "POST" });
+    return res.ok ? res.json() : null;
+  }
+
   uploadBtn.onclick = async () => {
     const files = [...uploadIn.files];
     const url   = urlIn.value.trim();
     if (!files.length && !url) return alert("Choose files or URL");
+    const large = files.filter(f => f.size > CHUNK);
     const fd = new FormData();
-    files.forEach(f => fd.append("files", f));
+    files.filter(f => f.size <= CHUNK).forEach(f => fd.append("files", f));
     if (url) fd.append("url", url);
 
     uploadBtn.disabled = true;
-    const ok = (await fetch(`/api/items/${itemId}/images`, { method: "POST", body: fd })).ok;
+    const jobs = [];
+    for (const file of large) {
+      const job = await uploadResumable(file);
+      if (job) jobs.push(job);
+      else alert(`Upload of ${file.name} failed`);
+    }
+    const res = large.length === files.length && !url
+      ? null
+      : await fetch(`/api/items/${itemId}/images`, { method: "POST", body: fd });
     uploadBtn.disabled = false;
-    if (ok) { uploadIn.value = ""; urlIn.value = ""; refreshGallery(); }
+    if (res?.ok) jobs.push(...(await res.json()));
+    if (jobs.length) {
+      uploadIn.value = ""; urlIn.value = "";
+      refreshGallery();
+      pollJobs(jobs);
+    }
   };
 
   lbClose.onclick = () => lightbox.classList.add("hidden");
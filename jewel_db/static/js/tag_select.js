@@ -1,6 +1,7 @@
 /* tag_select.js  ───────────────────────────────────────────────────────────
  *  Lightweight autocomplete for tags.
  *  • Fetches all tags once  →   const options = ["vintage", "wedding", …]
+ *  • While typing, asks /api/tags/autocomplete (prefix, most-used first).
  *  • Renders a custom absolute dropdown aligned with the <input>.
  *  • Only allows selecting existing tags; free-text ignored.
  *  • Fires:
@@ -51,11 +52,15 @@ export async function attachTagInput(textInput, hiddenField) {
   textInput.addEventListener("focus", showAll);
   textInput.addEventListener("keydown", e => { if (e.key === "ArrowDown") showAll(); });
 
-  /* live filter */
-  textInput.addEventListener("input", () => {
-    const v = textInput.value.toLowerCase();
-    const m = options.filter(o => o.includes(v)).slice(0,50);
-    render(v ? m : options);
+  /* live suggestions (latest keystroke wins) */
+  let pending = 0;
+  textInput.addEventListener("input", async () => {
+    const v = textInput.value.trim().toLowerCase();
+    if (!v) { render(options); return; }
+    const ticket = ++pending;
+    const r = await fetch(`/api/tags/autocomplete?q=${encodeURIComponent(v)}&limit=20`);
+    if (!r.ok || ticket !== pending) return;
+    render((await r.json()).map(s => s.name));
   });
 
   /* click a suggestion */
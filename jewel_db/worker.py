@@ -0,0 +1,55 @@
+# jewel_db/worker.py
+"""
+Image-processing worker.
+
+    poetry run python -m jewel_db.worker --processes 4
+
+Run as many of these, on as many hosts, as needed – they only share the
+database and the media directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import threading
+
+from jewel_db.core.database import get_engine
+from jewel_db.core.migrations import upgrade_schema
+from jewel_db.services.image_jobs import run_worker
+from jewel_db.services.resumable_upload import sweep_stale
+
+
+def _serve() -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    run_worker(get_engine(), stop=stop, sweep=sweep_stale)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process queued image uploads.")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(processName)s %(message)s"
+    )
+
+    upgrade_schema(get_engine())  # once, before any process touches the tables
+    if args.processes == 1:
+        _serve()
+        return
+    # spawn, not fork: each process must build its own engine / pool
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_serve) for _ in range(args.processes)]
+    for p in procs:
+        p.start()
+    signal.signal(signal.SIGTERM, lambda *_: [p.terminate() for p in procs])
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,11 @@ if [ -d ".venv" ]; then
   source .venv/bin/activate
 fi
 
+# Background worker that normalises uploaded images (see jewel_db/worker.py)
+poetry run python -m jewel_db.worker &
+WORKER_PID=$!
+trap 'kill "$WORKER_PID" 2>/dev/null' EXIT
+
 # Run Uvicorn with auto‐reload for development
 poetry run uvicorn jewel_db.main:app \
   --reload \
@@ -0,0 +1,57 @@
+"""
+Compute perceptual hashes for images stored before hashing existed.
+
+    poetry run python scripts/backfill_phash.py [--batch 500]
+
+The ``phash`` column itself is added to an existing database when the app
+or a worker starts (``jewel_db/core/migrations.py``); this script does the
+same first, so it can also run before either.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from sqlmodel import Session, select
+
+from jewel_db.core.database import get_engine
+from jewel_db.core.migrations import upgrade_schema
+from jewel_db.core.settings import settings
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.services.image_utils import dhash
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    upgrade_schema(get_engine())
+    media = Path(settings.media_dir)
+    done = missing = 0
+    with Session(get_engine()) as session:
+        while True:
+            images = session.exec(
+                select(JewelryImage)
+                .where(JewelryImage.phash.is_(None), JewelryImage.id > done)
+                .order_by(JewelryImage.id)
+                .limit(args.batch)
+            ).all()
+            if not images:
+                break
+            for img in images:
+                path = media / Path(img.url).name
+                if path.exists():
+                    img.phash = dhash(path.read_bytes())
+                    session.add(img)
+                else:
+                    missing += 1
+                done = img.id
+            session.commit()
+            print(f"… up to image {done}")
+    print(f"done, {missing} file(s) missing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Render-time benchmark for the HTML pages.
+
+Seeds a throw-away SQLite database, then times every page through the
+real app (query + template render) with the fragment cache cold and warm.
+
+    poetry run python scripts/bench_render.py --items 500 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from jewel_db.core.dependencies import get_db
+from jewel_db.core.models_import import import_models
+from jewel_db.core.templating import templates
+from jewel_db.main import app
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.models.jewelry_tag import JewelryTag
+
+
+def seed(engine, n_items: int) -> None:
+    with Session(engine) as session:
+        tags = [JewelryTag(name=f"tag{i}") for i in range(20)]
+        for i in range(n_items):
+            session.add(
+                JewelryItem(
+                    name=f"Item {i:05d}",
+                    material=("gold", "silver", "platinum")[i % 3],
+                    gemstone=(None, "ruby", "diamond")[i % 3],
+                    weight=1.5 + i % 7,
+                    price=50.0 + i,
+                    tags=tags[i % 20 : i % 20 + 3],
+                )
+            )
+        session.commit()
+
+
+def bench(client: TestClient, url: str, repeat: int) -> tuple[float, float, float]:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        r = client.get(url)
+        timings.append((time.perf_counter() - t0) * 1000)
+        r.raise_for_status()
+    p95 = statistics.quantiles(timings, n=20)[-1] if repeat > 1 else timings[0]
+    return timings[0], statistics.mean(timings[1:] or timings), p95
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        import_models()
+        SQLModel.metadata.create_all(engine)
+        seed(engine, args.items)
+
+        def _get_db():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _get_db
+        pages = [
+            "/",
+            "/items",
+            "/items?page=2&material=gold",
+            "/items/create",
+            "/items/1",
+            "/items/1/edit",
+            "/tags",
+        ]
+        with TestClient(app) as client:
+            print(f"{'page':32} {'first ms':>9} {'mean ms':>9} {'p95 ms':>9}")
+            for url in pages:
+                templates.env.fragment_cache.clear()
+                first, mean, p95 = bench(client, url, args.repeat)
+                print(f"{url:32} {first:9.2f} {mean:9.2f} {p95:9.2f}")
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Build step: write .br / .gz siblings for the static assets.
+
+    poetry run python scripts/precompress_static.py [directory]
+
+Re-run after changing anything under jewel_db/static; stale variants are
+ignored at serve time, so forgetting only costs compression, not
+correctness.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from jewel_db.core.compression import precompress_tree
+
+
+def main() -> None:
+    directory = sys.argv[1] if len(sys.argv) > 1 else "jewel_db/static"
+    for path, encoding, size, packed in precompress_tree(directory):
+        print(f"{encoding:5} {size:8d} → {packed:8d}  {path}")
+
+
+if __name__ == "__main__":
+    main()
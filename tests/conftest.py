@@ -1,8 +1,14 @@
 # tests/conftest.py
+import os
 import pathlib
 import tempfile
 
 import pytest
+
+# the app's own engine (startup work) gets a throwaway in-memory database;
+# requests use the per-test engine below through the get_db override
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
 from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, create_engine
 
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from jewel_db.core.models_import import import_models
+from jewel_db.models.jewelry_item import JewelryItem
+from jewel_db.services.analytics import ItemStats
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    import_models()
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _add(session, **fields) -> JewelryItem:
+    item = JewelryItem(name=f"item{fields.get('price')}", **fields)
+    session.add(item)
+    session.commit()
+    return item
+
+
+def test_stats_follow_the_change_feed(session):
+    for price in (10, 11, 12, 13, 14, 15):  # 1 g gold: ~12.5 per gram
+        _add(session, material="gold", gemstone="ruby", weight=1.0, price=price)
+    _add(session, material="silver", gemstone=None, weight=2.0, price=4)
+    stats = ItemStats()
+    stats.load(session)
+
+    summary = stats.summary(bins=5)
+    assert summary.items == 7
+    assert summary.price.count == 7 and summary.price.max == 15
+    assert summary.price.percentiles["p50"] == 12
+    assert sum(summary.price.histogram.counts) == 7
+    by_material = {g.key: g for g in summary.price_per_gram_by_material}
+    assert by_material["gold"].median_price_per_gram == 12.5
+    assert by_material["silver"].mean_price_per_gram == 2
+    assert {g.key for g in summary.price_per_gram_by_gemstone} == {"ruby", "none"}
+    assert summary.outliers == []
+
+    # a wildly overpriced gold piece, an edit and a delete – applied incrementally
+    odd = _add(session, material="gold", weight=1.0, price=90)
+    cheap = session.get(JewelryItem, 1)
+    cheap.price = 9
+    session.commit()
+    session.delete(session.get(JewelryItem, 7))
+    session.commit()
+    stats.ensure_fresh(session)
+
+    summary = stats.summary()
+    assert summary.items == 7 and summary.price.min == 9
+    assert [g.key for g in summary.price_per_gram_by_material] == ["gold"]
+    assert [o.item_id for o in summary.outliers] == [odd.id]
+    assert summary.outliers[0].price_per_gram > summary.outliers[0].expected_high
+
+
+def test_analytics_endpoint(client):
+    client.post("/api/items", json={"name": "Stats Ring", "weight": 2, "price": 50})
+    r = client.get("/api/analytics", params={"bins": 4})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["items"] >= 1
+    assert len(body["price"]["histogram"]["counts"]) == 4
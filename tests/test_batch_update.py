@@ -0,0 +1,127 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from jewel_db.services import batch_update
+
+
+def _item(client, **body):
+    return client.post("/api/items", json=body).json()
+
+
+def test_batch_patch_with_per_item_payloads(client):
+    a = _item(client, name="Batch A", price=10, tags=["batch-old"])
+    b = _item(client, name="Batch B", price=20)
+    since = client.get("/api/changes/head").json()["next"]
+
+    r = client.patch(
+        "/api/items/batch",
+        json={
+            "items": [
+                {"id": a["id"], "price": 11, "tags": ["Batch-New", "batch-x"]},
+                {"id": b["id"], "description": "restocked"},
+                {"id": 999_999, "price": 1},
+            ]
+        },
+    )
+    assert r.status_code == 200
+    report = r.json()
+    assert report["updated"] == 2
+    assert [res["status"] for res in report["results"]] == [
+        "updated",
+        "updated",
+        "not_found",
+    ]
+
+    got_a = client.get(f"/api/items/{a['id']}").json()
+    assert got_a["price"] == 11
+    assert sorted(t["name"] for t in got_a["tags"]) == ["batch-new", "batch-x"]
+    assert got_a["updated_at"] > a["updated_at"]
+    assert client.get(f"/api/items/{b['id']}").json()["description"] == "restocked"
+    assert client.get("/api/items", params={"tags": "batch-new"}).json()[0]["id"] == (
+        a["id"]
+    )
+
+    changed = {
+        c["entity_id"]
+        for c in client.get(f"/api/changes?since={since}").json()["changes"]
+        if c["entity"] == "item"
+    }
+    assert changed == {a["id"], b["id"]}
+
+
+def test_batch_patch_with_filter_and_expression(client):
+    gold = _item(client, name="Batch Gold", material="batchgold", price=100)
+    silver = _item(client, name="Batch Silver", material="batchsilver", price=100)
+
+    r = client.patch(
+        "/api/items/batch",
+        json={
+            "filter": {"material": "batchgold"},
+            "set": [{"field": "price", "op": "mul", "value": 1.04, "round": 2}],
+        },
+    )
+    assert r.status_code == 200
+    assert r.json()["results"] == [
+        {"id": gold["id"], "status": "updated", "detail": None}
+    ]
+    assert client.get(f"/api/items/{gold['id']}").json()["price"] == 104.0
+    assert client.get(f"/api/items/{silver['id']}").json()["price"] == 100
+
+    bad = client.patch(
+        "/api/items/batch",
+        json={
+            "filter": {"material": "batchgold"},
+            "set": [{"field": "name", "op": "add", "value": 1}],
+        },
+    )
+    assert bad.status_code == 400
+    assert client.patch("/api/items/batch", json={}).status_code == 422
+
+
+def test_batch_patch_rejects_bad_values_and_empty_filters(client):
+    item = _item(client, name="Batch Guard", material="batchguard", price=50)
+    patch = {"filter": {"material": "batchguard"}}
+
+    for bad in (
+        {"field": "price", "op": "set", "value": "abc"},
+        {"field": "name", "op": "set", "value": 3},
+        {"field": "name", "op": "set", "value": None},
+    ):
+        r = client.patch("/api/items/batch", json={**patch, "set": [bad]})
+        assert r.status_code == 400, bad
+
+    r = client.patch(
+        "/api/items/batch",
+        json={**patch, "set": [{"field": "price", "op": "set", "value": "75.5"}]},
+    )
+    assert r.status_code == 200
+    assert client.get(f"/api/items/{item['id']}").json()["price"] == 75.5
+
+    everything = [{"field": "description", "op": "set", "value": "x"}]
+    r = client.patch("/api/items/batch", json={"filter": {}, "set": everything})
+    assert r.status_code == 400
+    assert client.get(f"/api/items/{item['id']}").json()["description"] != "x"
+
+
+def test_batch_patch_conflicting_with_another_writer_is_a_409(
+    client, engine, monkeypatch
+):
+    item = _item(client, name="Batch Raced", price=10)
+
+    class _Clock(datetime):
+        @classmethod
+        def utcnow(cls):  # runs between the version read and the UPDATE
+            with engine.begin() as conn:
+                conn.execute(
+                    text("UPDATE jewelryitem SET version = version + 1 WHERE id = :id"),
+                    {"id": item["id"]},
+                )
+            return datetime.utcnow()
+
+    monkeypatch.setattr(batch_update, "datetime", _Clock)
+    r = client.patch(
+        "/api/items/batch", json={"items": [{"id": item["id"], "price": 99}]}
+    )
+    assert r.status_code == 409
+    assert client.get(f"/api/items/{item['id']}").json()["price"] == 10
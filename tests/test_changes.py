@@ -0,0 +1,60 @@
+from sqlmodel import Session
+
+from jewel_db.models.jewelry_image import JewelryImage
+
+
+def _changes(client, since, **params):
+    r = client.get("/api/changes", params={"since": since, **params})
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_change_feed_reports_upserts_and_tombstones(client, engine):
+    since = client.get("/api/changes/head").json()["next"]
+    item = client.post(
+        "/api/items", json={"name": "Feed Ring", "price": 100, "tags": ["feedtag"]}
+    ).json()
+    with Session(engine) as session:
+        img = JewelryImage(url="/media/feed.jpg", item_id=item["id"])
+        session.add(img)
+        session.commit()
+        image_id = img.id
+    client.patch(f"/api/items/{item['id']}", json={"price": 120})
+
+    feed = _changes(client, since)
+    assert not feed["has_more"]
+    assert [(c["entity"], c["op"]) for c in feed["changes"]] == [
+        ("tag", "upsert"),
+        ("image", "upsert"),
+        ("item", "upsert"),  # create + update collapsed into the latest
+    ]
+    assert feed["changes"][0]["tag"]["name"] == "feedtag"
+    assert feed["changes"][1]["image"]["url"] == "/media/feed.jpg"
+    assert feed["changes"][2]["item"]["price"] == 120
+    assert _changes(client, feed["next"])["changes"] == []
+
+    # renaming a tag changes every item carrying it
+    since = feed["next"]
+    tag_id = feed["changes"][0]["entity_id"]
+    client.patch(f"/api/tags/{tag_id}", json={"name": "feedtag2"})
+    feed = _changes(client, since)
+    by_entity = {c["entity"]: c for c in feed["changes"]}
+    assert len(feed["changes"]) == 2
+    assert by_entity["tag"]["tag"] == {"id": tag_id, "name": "feedtag2"}
+    change = by_entity["item"]
+    assert change["entity_id"] == item["id"]
+    assert change["item"]["tags"][0]["name"] == "feedtag2"
+    assert change["item"]["updated_at"] > item["updated_at"]
+
+    # deletes leave tombstones for the item and its images
+    since = feed["next"]
+    client.delete(f"/api/items/{item['id']}")
+    feed = _changes(client, since)
+    assert {(c["entity"], c["entity_id"], c["op"]) for c in feed["changes"]} == {
+        ("item", item["id"], "delete"),
+        ("image", image_id, "delete"),
+    }
+    assert all(c["item"] is None and c["image"] is None for c in feed["changes"])
+
+    page = _changes(client, since, limit=1)
+    assert page["has_more"] and len(page["changes"]) == 1
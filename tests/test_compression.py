@@ -0,0 +1,46 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from jewel_db.core.compression import (
+    PrecompressedStaticFiles,
+    negotiate,
+    precompress_tree,
+)
+
+
+def test_negotiate_honours_q_values():
+    assert negotiate("gzip, br", ("br", "gzip")) == ["br", "gzip"]
+    assert negotiate("br;q=0.5, gzip", ("br", "gzip")) == ["gzip", "br"]
+    assert negotiate("br;q=0, *", ("br", "gzip")) == ["gzip"]
+    assert negotiate("identity", ("br", "gzip")) == []
+
+
+def test_html_is_compressed_and_small_json_is_not(client):
+    r = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert "<html" in r.text  # httpx transparently decodes
+
+    r = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+
+
+def test_precompressed_static_variant_is_served(tmp_dir):
+    static = tmp_dir / "static"
+    static.mkdir()
+    (static / "app.js").write_text("console.log('jewel');\n" * 200)
+    assert list(precompress_tree(static, min_size=1))
+    assert (static / "app.js.gz").exists()
+
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=static))
+    with TestClient(app) as c:
+        r = c.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        assert r.headers["content-encoding"] == "gzip"
+        assert "javascript" in r.headers["content-type"]
+        assert r.content.startswith(b"console.log")
+        raw = c.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in raw.headers
+    assert gzip.decompress((static / "app.js.gz").read_bytes()) == raw.content
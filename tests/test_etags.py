@@ -0,0 +1,104 @@
+from jewel_db.core.etags import etag_matches
+
+
+def test_item_etag_304_and_if_match(client):
+    item = client.post("/api/items", json={"name": "Etag Ring", "tags": ["etag"]})
+    item_id = item.json()["id"]
+
+    r = client.get(f"/api/items/{item_id}")
+    etag = r.headers["etag"]
+    cached = client.get(f"/api/items/{item_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+
+    # a weak tag does not satisfy If-Match
+    weak = client.patch(
+        f"/api/items/{item_id}", json={"price": 6}, headers={"If-Match": f"W/{etag}"}
+    )
+    assert weak.status_code == 412
+    ok = client.patch(
+        f"/api/items/{item_id}", json={"price": 5}, headers={"If-Match": etag}
+    )
+    assert ok.status_code == 200 and ok.headers["etag"] != etag
+    stale = client.patch(
+        f"/api/items/{item_id}", json={"price": 6}, headers={"If-Match": etag}
+    )
+    assert stale.status_code == 412
+    assert client.get(f"/api/items/{item_id}").json()["price"] == 5
+
+    # renaming a tag the item carries changes its representation too
+    etag = ok.headers["etag"]
+    tag_id = ok.json()["tags"][0]["id"]
+    client.patch(f"/api/tags/{tag_id}", json={"name": "etag2"})
+    r = client.get(f"/api/items/{item_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.json()["tags"][0]["name"] == "etag2"
+
+    # and so does a batch update
+    etag = r.headers["etag"]
+    client.patch("/api/items/batch", json={"items": [{"id": item_id, "price": 7}]})
+    r = client.get(f"/api/items/{item_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+
+
+def test_compressed_item_carries_a_strong_etag_of_its_own(client):
+    body = {"name": "Etag Gzip", "description": "long " * 200}
+    item_id = client.post("/api/items", json=body).json()["id"]
+    plain = client.get(
+        f"/api/items/{item_id}", headers={"Accept-Encoding": "identity"}
+    ).headers["etag"]
+
+    r = client.get(f"/api/items/{item_id}", headers={"Accept-Encoding": "gzip"})
+    etag = r.headers["etag"]
+    assert r.headers["content-encoding"] == "gzip"
+    assert etag == plain[:-1] + '-gzip"'
+
+    cached = client.get(
+        f"/api/items/{item_id}",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+    assert cached.status_code == 304 and cached.headers["etag"] == etag
+    ok = client.patch(
+        f"/api/items/{item_id}",
+        json={"price": 5},
+        headers={"Accept-Encoding": "gzip", "If-Match": etag},
+    )
+    assert ok.status_code == 200
+
+
+def test_item_etag_is_not_reused_after_delete(client):
+    old = client.post("/api/items", json={"name": "Etag Gone"}).json()["id"]
+    etag = client.get(f"/api/items/{old}").headers["etag"]
+    client.delete(f"/api/items/{old}")
+
+    new = client.post("/api/items", json={"name": "Etag Newcomer"}).json()["id"]
+    assert new != old
+    r = client.get(f"/api/items/{new}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+
+
+def test_list_etags_follow_the_change_feed(client):
+    item_id = client.post("/api/items", json={"name": "Etag List"}).json()["id"]
+
+    images = client.get(f"/api/items/{item_id}/images")
+    etag = images.headers["etag"]
+    r = client.get(f"/api/items/{item_id}/images", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    tags = client.get("/api/tags")
+    r = client.get("/api/tags", headers={"If-None-Match": tags.headers["etag"]})
+    assert r.status_code == 304
+    client.post("/api/tags", json={"name": "etag-new"})
+    r = client.get("/api/tags", headers={"If-None-Match": tags.headers["etag"]})
+    assert r.status_code == 200
+
+
+def test_etag_matching():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches('"b-gzip"', '"b"')  # a compressed variant
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"a"', '"b"') and not etag_matches(None, '"a"')
+    # If-Match: strong comparison, weak tags never satisfy it
+    assert etag_matches('"a"', '"a"', weak=False)
+    assert not etag_matches('W/"a"', '"a"', weak=False)
+    assert not etag_matches('"a"', 'W/"a"', weak=False)
+    assert etag_matches('"a-br"', '"a"', weak=False)
+    assert not etag_matches('"a-br"', '"b"', weak=False)
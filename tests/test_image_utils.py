@@ -2,7 +2,7 @@ from io import BytesIO
 
 from PIL import Image
 
-from jewel_db.services.image_utils import normalise_image
+from jewel_db.services.image_utils import dhash, normalise_image
 
 
 def test_image_is_resized_to_max_1600_px():
@@ -15,3 +15,26 @@ def test_image_is_resized_to_max_1600_px():
     img = Image.open(BytesIO(out_bytes))
 
     assert max(img.size) <= 1600
+
+
+def _jpeg(img: Image.Image) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=80)
+    return buf.getvalue()
+
+
+def _distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def test_dhash_is_stable_under_recrop_but_not_across_images():
+    # horizontal gradient with a dark block – a stand-in product shot
+    base = Image.linear_gradient("L").rotate(90).resize((400, 300)).convert("RGB")
+    base.paste((20, 20, 20), (250, 80, 330, 200))
+    recrop = base.crop((8, 6, 392, 294)).resize((640, 480))
+    other = base.transpose(Image.FLIP_LEFT_RIGHT)
+
+    h_base, h_crop, h_other = (dhash(_jpeg(i)) for i in (base, recrop, other))
+    assert len(h_base) == 16
+    assert _distance(h_base, h_crop) <= 6
+    assert _distance(h_base, h_other) > 20
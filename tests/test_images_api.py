@@ -0,0 +1,392 @@
+import hashlib
+import threading
+import zipfile
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+from jewel_db.api import items as items_api
+from jewel_db.api import uploads as uploads_api
+from jewel_db.core.settings import settings
+from jewel_db.models.image_job import ImageJob
+from jewel_db.models.jewelry_image import JewelryImage
+from jewel_db.models.upload_session import UploadSession
+from jewel_db.services import image_jobs
+from jewel_db.services.image_index import ImageHashIndex
+from jewel_db.services.image_jobs import claim_job, process_job, run_worker
+from jewel_db.services.resumable_upload import (
+    UploadConflict,
+    append_chunk,
+    sweep_stale,
+)
+
+
+@pytest.fixture
+def media_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(items_api, "MEDIA_DIR", tmp_path)
+    monkeypatch.setattr(uploads_api, "MEDIA_DIR", tmp_path)
+    return tmp_path
+
+
+def _photo(size=(320, 240)) -> bytes:
+    img = Image.linear_gradient("L").resize((320, 240)).convert("RGB")
+    img.paste((200, 30, 30), (40, 40, 120, 160))
+    buf = BytesIO()
+    img.resize(size).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _drain(engine) -> int:
+    """Run queued jobs in-process, as a worker would."""
+    done = 0
+    with Session(engine) as session:
+        while (job := claim_job(session, "test-worker")) is not None:
+            process_job(session, job, "test-worker")
+            done += 1
+    return done
+
+
+def test_upload_queues_jobs_then_flags_near_duplicates(client, engine, media_dir):
+    a = client.post("/api/items", json={"name": "Dup Source"}).json()["id"]
+    b = client.post("/api/items", json={"name": "Dup Copy"}).json()["id"]
+
+    first = client.post(
+        f"/api/items/{a}/images", files=[("files", ("a.jpg", _photo(), "image/jpeg"))]
+    )
+    assert first.status_code == 202
+    job = first.json()[0]
+    assert job["status"] == "queued" and job["image_status"] == "pending"
+    assert client.get(f"/api/items/{a}/images").json()[0]["status"] == "pending"
+
+    assert _drain(engine) == 1
+    job = client.get(f"/api/jobs/{job['id']}").json()
+    assert job["status"] == "done" and job["image_status"] == "ready"
+    assert (media_dir / job["image_url"].rsplit("/", 1)[1]).is_file()
+    assert not list((media_dir / "incoming").iterdir())  # spool cleaned up
+    original = job["image_id"]
+
+    # same shot, re-encoded at another size, on a different item
+    second = client.post(
+        f"/api/items/{b}/images",
+        files=[("files", ("b.jpg", _photo((640, 480)), "image/jpeg"))],
+    )
+    _drain(engine)
+    (copy,) = client.get(f"/api/jobs/?ids={second.json()[0]['id']}").json()
+    assert [d["image_id"] for d in copy["duplicates"]] == [original]
+
+    r = client.get(f"/api/items/{a}/images/{original}/similar")
+    assert r.status_code == 200
+    assert [(s["image_id"], s["item_id"]) for s in r.json()] == [(copy["image_id"], b)]
+
+    client.delete(f"/api/items/{b}")
+    assert client.get(f"/api/items/{a}/images/{original}/similar").json() == []
+
+
+def test_unreadable_upload_fails_after_max_attempts(
+    client, engine, media_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "image_job_max_attempts", 2)
+    monkeypatch.setattr(settings, "image_job_retry_s", 0.0)
+    item = client.post("/api/items", json={"name": "Broken"}).json()["id"]
+    job = client.post(
+        f"/api/items/{item}/images",
+        files=[("files", ("x.png", b"not an image", "image/png"))],
+    ).json()[0]
+
+    assert _drain(engine) == 2  # first attempt + one retry
+    job = client.get(f"/api/jobs/{job['id']}").json()
+    assert job["status"] == "failed" and job["attempts"] == 2
+    assert job["image_status"] == "failed" and job["error"]
+
+
+def _queue_one(client, name: str) -> dict:
+    item = client.post("/api/items", json={"name": name}).json()["id"]
+    return client.post(
+        f"/api/items/{item}/images",
+        files=[("files", ("a.jpg", _photo(), "image/jpeg"))],
+    ).json()[0]
+
+
+def test_worker_whose_lease_expired_does_not_finish_twice(client, engine, media_dir):
+    queued = _queue_one(client, "Slow Worker")
+    with Session(engine) as slow, Session(engine) as fast:
+        job = claim_job(slow, "slow")
+        job.locked_at = datetime.utcnow() - timedelta(days=1)  # lease expires
+        slow.add(job)
+        slow.commit()
+
+        reclaimed = claim_job(fast, "fast")
+        assert reclaimed.id == queued["id"]
+        process_job(fast, reclaimed, "fast")
+        process_job(slow, slow.get(ImageJob, queued["id"]), "slow")  # too late: no-op
+
+    job = client.get(f"/api/jobs/{queued['id']}").json()
+    assert (job["status"], job["attempts"], job["image_status"]) == ("done", 2, "ready")
+
+
+def test_worker_that_lost_its_lease_does_not_publish(
+    client, engine, media_dir, monkeypatch
+):
+    queued = _queue_one(client, "Overtaken")
+    real_dhash = image_jobs.dhash
+
+    def overtaken(data):  # the slow worker's output is written, not yet published
+        monkeypatch.setattr(image_jobs, "dhash", real_dhash)
+        (stale,) = media_dir.glob(".*.part")
+        stale.write_bytes(b"stale")
+        with Session(engine) as fast:
+            fast.execute(
+                update(ImageJob)
+                .where(ImageJob.id == queued["id"])
+                .values(locked_at=datetime.utcnow() - timedelta(days=1))
+            )
+            fast.commit()
+            process_job(fast, claim_job(fast, "fast"), "fast")
+        return real_dhash(data)
+
+    monkeypatch.setattr(image_jobs, "dhash", overtaken)
+    with Session(engine) as slow:
+        process_job(slow, claim_job(slow, "slow"), "slow")
+
+    with Session(engine) as session:
+        job = session.get(ImageJob, queued["id"])
+        assert (job.status, job.locked_by) == ("done", None)
+        assert Path(job.target_path).read_bytes() != b"stale"
+    assert not list(media_dir.glob(".*.part"))
+
+
+def test_image_deleted_while_processing_removes_its_file(
+    client, engine, media_dir, monkeypatch
+):
+    queued = _queue_one(client, "Vanishing")
+
+    def delete_then_hash(data):
+        with Session(engine) as other:
+            other.delete(other.get(JewelryImage, queued["image_id"]))
+            other.commit()
+        return "0" * 16
+
+    monkeypatch.setattr(image_jobs, "dhash", delete_then_hash)
+    assert _drain(engine) == 1
+    with Session(engine) as session:
+        job = session.get(ImageJob, queued["id"])
+        assert (job.status, job.locked_by) == ("cancelled", None)
+        assert not Path(job.target_path).exists()
+
+
+def test_worker_loop_survives_database_errors(engine, monkeypatch):
+    monkeypatch.setattr(settings, "image_job_poll_s", 0.0)
+    stop = threading.Event()
+    calls = []
+
+    def flaky_claim(session, worker_id):
+        calls.append(worker_id)
+        if len(calls) == 1:
+            raise OperationalError("UPDATE imagejob", {}, "database is locked")
+        stop.set()
+        return None
+
+    monkeypatch.setattr(image_jobs, "claim_job", flaky_claim)
+    run_worker(engine, "w", stop)
+    assert len(calls) == 2
+
+
+def test_bulk_zip_upload_matches_items_by_filename(
+    client, engine, media_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "bulk_upload_batch", 2)
+    monkeypatch.setattr(settings, "bulk_upload_max_member", 100_000)
+    by_id = client.post("/api/items", json={"name": "Bulk By Id"}).json()["id"]
+    by_name = client.post("/api/items", json={"name": "Bulk Named Ring"}).json()["id"]
+
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr(f"shoot/{by_id}_1.jpg", _photo())
+        zf.writestr(f"shoot/{by_id}_2.jpg", _photo((200, 150)))
+        zf.writestr("bulk_named_ring.JPG", _photo())
+        zf.writestr("nobody_1.jpg", _photo())
+        zf.writestr("huge_1.jpg", b"\0" * 200_000)
+        zf.writestr("notes.txt", "shot list")
+        zf.writestr("__MACOSX/._bulk_named_ring.JPG", b"")
+    r = client.post(
+        "/api/items/images/bulk",
+        files={"archive": ("shoot.zip", buf.getvalue(), "application/zip")},
+    )
+    assert r.status_code == 202
+    report = r.json()
+    assert (report["queued"], report["not_queued"]) == (3, 3)
+    results = {res["filename"]: res for res in report["results"]}
+    assert results[f"shoot/{by_id}_2.jpg"]["item_id"] == by_id
+    assert results["bulk_named_ring.JPG"]["item_id"] == by_name
+    assert results["nobody_1.jpg"]["status"] == "unmatched"
+    assert results["huge_1.jpg"]["status"] == "rejected"
+    assert results["notes.txt"]["status"] == "skipped"
+    assert all(res["job_id"] for res in results.values() if res["status"] == "queued")
+
+    _drain(engine)
+    images = client.get(f"/api/items/{by_id}/images").json()
+    assert [(i["sort_order"], i["status"]) for i in images] == [
+        (1, "ready"),
+        (2, "ready"),
+    ]
+
+    bad = client.post(
+        "/api/items/images/bulk",
+        files={"archive": ("x.zip", b"not a zip", "application/zip")},
+    )
+    assert bad.status_code == 400
+
+
+def test_bulk_zip_reports_corrupt_members_per_file(client, engine, media_dir):
+    item = client.post("/api/items", json={"name": "Bulk Corrupt"}).json()["id"]
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{item}_1.jpg", _photo())
+        zf.writestr(f"{item}_2.jpg", _photo((200, 150)))
+    data = bytearray(buf.getvalue())
+    info = zipfile.ZipFile(BytesIO(bytes(data))).getinfo(f"{item}_2.jpg")
+    start = info.header_offset + 30 + len(info.filename) + len(info.extra)
+    data[start : start + 8] = b"\xff" * 8  # invalid deflate block
+
+    r = client.post(
+        "/api/items/images/bulk",
+        files={"archive": ("bad.zip", bytes(data), "application/zip")},
+    )
+    assert r.status_code == 202
+    results = {res["filename"]: res for res in r.json()["results"]}
+    assert results[f"{item}_1.jpg"]["status"] == "queued"
+    assert results[f"{item}_2.jpg"]["status"] == "error"
+    assert "decompressing" in results[f"{item}_2.jpg"]["detail"]
+    assert len(client.get(f"/api/items/{item}/images").json()) == 1
+    assert len(list((media_dir / "incoming").iterdir())) == 1
+
+
+def test_resumable_upload_in_chunks(client, engine, media_dir):
+    item = client.post("/api/items", json={"name": "Master Shot"}).json()["id"]
+    data = _photo((1200, 900))
+    half = len(data) // 2
+    r = client.post(
+        "/api/uploads/",
+        json={
+            "item_id": item,
+            "filename": "master.jpg",
+            "content_type": "image/jpeg",
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        },
+    )
+    assert r.status_code == 201
+    upload = r.json()["id"]
+    chunk_url = f"/api/uploads/{upload}/chunks"
+
+    def put(index, offset, body, digest=None):
+        headers = {"Upload-Offset": str(offset)}
+        headers["X-Chunk-Sha256"] = digest or hashlib.sha256(body).hexdigest()
+        return client.put(f"{chunk_url}/{index}", content=body, headers=headers)
+
+    assert put(0, 0, data[:half]).status_code == 204
+    # the response was lost, the client retries: refused, offset unchanged
+    retry = put(0, 0, data[:half])
+    assert retry.status_code == 409 and retry.headers["Upload-Offset"] == str(half)
+    assert put(1, half, data[half:], digest="0" * 64).status_code == 400
+    assert client.post(f"/api/uploads/{upload}/complete").status_code == 409
+
+    head = client.head(f"/api/uploads/{upload}")
+    assert (head.headers["Upload-Offset"], head.headers["Upload-Chunk"]) == (
+        str(half),
+        "1",
+    )
+    assert put(1, half, data[half:] + b"extra").status_code == 413
+    assert put(1, half, data[half:]).status_code == 204
+
+    done = client.post(f"/api/uploads/{upload}/complete")
+    assert done.status_code == 202
+    again = client.post(f"/api/uploads/{upload}/complete")
+    assert again.json()["id"] == done.json()["id"]
+    assert not list((media_dir / "uploads").iterdir())  # moved into the queue
+
+    _drain(engine)
+    assert client.get(f"/api/items/{item}/images").json()[0]["status"] == "ready"
+
+
+def test_stale_upload_sessions_are_swept(client, media_dir, monkeypatch):
+    item = client.post("/api/items", json={"name": "Abandoned"}).json()["id"]
+    body = {"item_id": item, "filename": "a.png", "content_type": "image/png"}
+    first = client.post("/api/uploads/", json={**body, "size": 10}).json()["id"]
+    client.put(
+        f"/api/uploads/{first}/chunks/0",
+        content=b"12345",
+        headers={"Upload-Offset": "0"},
+    )
+
+    monkeypatch.setattr(settings, "upload_session_ttl", -1.0)
+    client.post("/api/uploads/", json={**body, "size": 10})
+    assert client.get(f"/api/uploads/{first}").status_code == 404
+    assert not (media_dir / "uploads" / first).exists()
+
+
+def test_racing_chunk_puts_keep_the_first_one(client, engine, media_dir):
+    item = client.post("/api/items", json={"name": "Raced"}).json()["id"]
+    body = {"item_id": item, "filename": "r.png", "content_type": "image/png"}
+    upload_id = client.post("/api/uploads/", json={**body, "size": 10}).json()["id"]
+    with Session(engine) as one, Session(engine) as two:
+        first, second = one.get(UploadSession, upload_id), two.get(
+            UploadSession, upload_id
+        )
+        # both requests passed the offset check before either appended
+        parts = []
+        for n, data in enumerate((b"12345", b"abc")):
+            parts.append(Path(f"{first.path}.{n}.part"))
+            parts[-1].write_bytes(data)
+        append_chunk(one, first, parts[0], index=0, offset=0)
+        with pytest.raises(UploadConflict):
+            append_chunk(two, second, parts[1], index=0, offset=0)
+        assert (second.offset, second.chunks) == (5, 1)
+        assert Path(first.path).read_bytes() == b"12345"
+        assert not any(part.exists() for part in parts)
+
+
+def test_worker_loop_sweeps_stale_uploads(client, engine, media_dir, monkeypatch):
+    item = client.post("/api/items", json={"name": "Forgotten"}).json()["id"]
+    body = {"item_id": item, "filename": "f.png", "content_type": "image/png"}
+    upload_id = client.post("/api/uploads/", json={**body, "size": 10}).json()["id"]
+    monkeypatch.setattr(settings, "upload_session_ttl", -1.0)
+    monkeypatch.setattr(settings, "image_job_poll_s", 0.0)
+    stop = threading.Event()
+    swept = []
+
+    def sweep(session):
+        swept.append(sweep_stale(session))
+        stop.set()
+
+    run_worker(engine, "w", stop, sweep=sweep)
+    assert len(swept) == 1 and swept[0] >= 1  # the db is shared across tests
+    assert client.get(f"/api/uploads/{upload_id}").status_code == 404
+    assert not (media_dir / "uploads" / upload_id).exists()
+
+
+def test_stale_image_index_reloads_in_the_background(engine, monkeypatch):
+    index = ImageHashIndex()
+    with Session(engine) as session:
+        index.load(session)
+        monkeypatch.setattr(settings, "image_index_ttl", -1.0)
+        release, reloaded = threading.Event(), threading.Event()
+        load = index.load
+
+        def slow_load(session):
+            release.wait(5)
+            load(session)
+            reloaded.set()
+
+        monkeypatch.setattr(index, "load", slow_load)
+        index.ensure_fresh(session)  # returns while the reload is blocked
+        index.ensure_fresh(session)  # … and does not start a second one
+        assert not reloaded.is_set()
+        release.set()
+        assert reloaded.wait(5)
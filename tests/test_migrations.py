@@ -0,0 +1,58 @@
+from sqlalchemy import inspect, text
+from sqlmodel import Session, create_engine, select
+
+from jewel_db.core.migrations import upgrade_schema
+from jewel_db.models.jewelry_image import JewelryImage
+
+
+def test_upgrade_adds_missing_columns_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/old.db")
+    with engine.begin() as conn:  # jewelryimage before phash and status
+        conn.execute(
+            text(
+                "CREATE TABLE jewelryimage (id INTEGER PRIMARY KEY, url VARCHAR,"
+                " sort_order INTEGER, uploaded_at DATETIME, item_id INTEGER)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO jewelryimage VALUES"
+                " (1, '/media/a.webp', 0, '2024-01-01', 1)"
+            )
+        )
+
+    assert upgrade_schema(engine) == ["jewelryimage.phash", "jewelryimage.status"]
+    assert upgrade_schema(engine) == []
+    columns = {c["name"] for c in inspect(engine).get_columns("jewelryimage")}
+    assert {"phash", "status"} <= columns
+    with Session(engine) as session:
+        image = session.exec(select(JewelryImage)).one()
+        assert (image.phash, image.status) == (None, "ready")
+
+
+def test_upgrade_skips_tables_that_do_not_exist_yet(tmp_path):
+    assert upgrade_schema(create_engine(f"sqlite:///{tmp_path}/empty.db")) == []
+
+
+def test_upgrade_backfills_item_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/items.db")
+    with engine.begin() as conn:  # jewelryitem before the change feed
+        conn.execute(
+            text(
+                "CREATE TABLE jewelryitem (id INTEGER PRIMARY KEY, name VARCHAR,"
+                " created_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO jewelryitem VALUES (1, 'Old', '2024-01-01 10:00:00')")
+        )
+
+    assert upgrade_schema(engine) == ["jewelryitem.updated_at", "jewelryitem.version"]
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT created_at, updated_at, version FROM jewelryitem")
+        )
+        created, updated, version = row.one()
+    assert (updated, version) == (created, 1)
+    indexes = {i["name"] for i in inspect(engine).get_indexes("jewelryitem")}
+    assert "ix_jewelryitem_updated_at" in indexes
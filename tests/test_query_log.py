@@ -0,0 +1,62 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine
+
+from jewel_db.core.dependencies import get_db
+from jewel_db.core.query_log import SlowQueryLog, install_slow_query_log
+from jewel_db.core.settings import settings
+from jewel_db.main import app
+
+
+def test_slow_queries_record_route_shape_and_plan(tmp_dir):
+    engine = create_engine(f"sqlite:///{tmp_dir}/slowlog.db")
+    SQLModel.metadata.create_all(engine)
+    log = SlowQueryLog(maxlen=5)
+    install_slow_query_log(engine, log, threshold_ms=0)
+
+    def _get_test_db():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_test_db
+    with TestClient(app) as c:
+        assert c.get("/api/items/42").status_code == 404
+    app.dependency_overrides.clear()
+
+    entry = next(e for e in log.entries() if "FROM jewelryitem" in e["statement"])
+    assert entry["route"] == "GET /api/items/{item_id}"
+    assert entry["param_shape"] == ["int"]
+    assert entry["plan"]  # EXPLAIN QUERY PLAN captured
+    assert len(log.entries()) <= 5  # bounded ring buffer
+
+
+def test_failed_statement_does_not_skew_later_timings(tmp_dir):
+    engine = create_engine(f"sqlite:///{tmp_dir}/slowlog_err.db")
+    log = SlowQueryLog(maxlen=10)
+    install_slow_query_log(engine, log, threshold_ms=0)
+
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        time.sleep(0.05)
+        conn.execute(text("SELECT 1"))
+
+    entry = next(e for e in log.entries() if e["statement"] == "SELECT 1")
+    assert 0 <= entry["duration_ms"] < 50  # not measured from the failed statement
+
+
+def test_admin_api_needs_the_admin_token(client, monkeypatch):
+    assert client.get("/api/admin/slow-queries").status_code == 404  # disabled
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    assert client.get("/api/admin/slow-queries").status_code == 403
+    assert client.delete("/api/admin/slow-queries").status_code == 403
+    wrong = {"X-Admin-Token": "guess"}
+    assert client.get("/api/admin/slow-queries", headers=wrong).status_code == 403
+
+    ok = {"X-Admin-Token": "s3cret"}
+    assert client.get("/api/admin/slow-queries", headers=ok).status_code == 200
+    assert client.delete("/api/admin/slow-queries", headers=ok).status_code == 204
@@ -0,0 +1,57 @@
+import pytest
+
+from jewel_db.services.tag_index import TagExpressionError, parse_tag_expression
+
+
+def test_parse_precedence_and_implicit_and():
+    assert parse_tag_expression('gold vintage OR NOT "white gold"') == (
+        "or",
+        ("and", ("tag", "gold"), ("tag", "vintage")),
+        ("not", ("tag", "white gold")),
+    )
+    with pytest.raises(TagExpressionError):
+        parse_tag_expression("gold AND (ring")
+
+
+def test_deep_or_long_expressions_are_rejected(client):
+    parse_tag_expression("not " * 32 + "gold")
+    with pytest.raises(TagExpressionError, match="deeper"):
+        parse_tag_expression("(" * 40 + "gold" + ")" * 40)
+    with pytest.raises(TagExpressionError, match="longer"):
+        parse_tag_expression(" AND ".join(["gold"] * 200))
+    for expression in ["not " * 40 + "gold", "not " * 3000 + "gold"]:
+        r = client.get("/api/items", params={"tags": expression})
+        assert r.status_code == 400
+
+
+def test_items_filtered_by_tag_expression(client):
+    ids = {}
+    for name, tags in [
+        ("Filter Gold Vintage Ring", ["fgold", "fvintage", "fring"]),
+        ("Filter Gold Vintage Brooch", ["fgold", "fvintage"]),
+        ("Filter Silver Vintage", ["fsilver", "fvintage"]),
+    ]:
+        ids[name] = client.post("/api/items", json={"name": name, "tags": tags}).json()[
+            "id"
+        ]
+
+    r = client.get("/api/items", params={"tags": "fgold AND fvintage AND NOT fring"})
+    assert [i["id"] for i in r.json()] == [ids["Filter Gold Vintage Brooch"]]
+
+    r = client.get("/api/items", params={"tags": "fsilver OR fring"})
+    assert {i["id"] for i in r.json()} == {
+        ids["Filter Gold Vintage Ring"],
+        ids["Filter Silver Vintage"],
+    }
+
+    # updates and deletes keep the index current
+    client.patch(f"/api/items/{ids['Filter Silver Vintage']}", json={"tags": ["fgold"]})
+    client.delete(f"/api/items/{ids['Filter Gold Vintage Ring']}")
+    r = client.get("/api/items", params={"tags": "fgold"})
+    assert {i["id"] for i in r.json()} == {
+        ids["Filter Gold Vintage Brooch"],
+        ids["Filter Silver Vintage"],
+    }
+
+    assert client.get("/api/items", params={"tags": "NOT"}).status_code == 400
+    assert client.get("/items", params={"tags": "fgold"}).status_code == 200
@@ -5,3 +5,28 @@ def test_tags_validator_strips_null_and_blanks():
     payload = {"name": "Ring A", "tags": [None, "", "ruby", " "]}
     obj = JewelryItemCreate(**payload)
     assert obj.tags == ["ruby"]  # space was trimmed, None removed
+
+
+def test_autocomplete_ranks_by_usage(client):
+    for name, tags in [
+        ("Gold Chain", ["gold", "chain"]),
+        ("Gold Ring", ["gold", "ring"]),
+        ("Garnet Brooch", ["garnet"]),
+    ]:
+        assert client.post("/api/items", json={"name": name, "tags": tags}).is_success
+
+    r = client.get("/api/tags/autocomplete", params={"q": "G", "limit": 2})
+    assert r.status_code == 200
+    assert [s["name"] for s in r.json()] == ["gold", "garnet"]
+    assert r.json()[0]["count"] >= 2
+
+    # renames and deletes are reflected without a reload
+    tag_id = next(
+        t["id"] for t in client.get("/api/tags").json() if t["name"] == "garnet"
+    )
+    client.patch(f"/api/tags/{tag_id}", json={"name": "grossular"})
+    assert [s["name"] for s in client.get("/api/tags/autocomplete?q=gr").json()] == [
+        "grossular"
+    ]
+    client.delete(f"/api/tags/{tag_id}")
+    assert client.get("/api/tags/autocomplete?q=gr").json() == []
@@ -0,0 +1,12 @@
+from jewel_db.core.templating import templates
+
+
+def test_cache_tag_reuses_fragment_until_stamp_changes():
+    tpl = templates.env.from_string(
+        '{% cache "card", item_id, stamp %}<b>{{ name }}</b>{% endcache %}'
+    )
+    assert tpl.render(item_id=1, stamp="a", name="Ring") == "<b>Ring</b>"
+    # same key → cached markup, even though the context changed
+    assert tpl.render(item_id=1, stamp="a", name="Brooch") == "<b>Ring</b>"
+    # new version stamp → re-rendered (and still autoescaped)
+    assert tpl.render(item_id=1, stamp="b", name="<x>") == "<b>&lt;x&gt;</b>"